@@ -0,0 +1,65 @@
+# bench_calc_batch.py
+# Throughput: one POST /calculate per row vs one POST /calculate/batch
+# Uses Flask's test client, so no network is involved and the numbers
+# are a lower bound for the per-request path.
+# Run: python bench_calc_batch.py
+import os
+import random
+import tempfile
+import time
+
+SIZES = [1_000, 100_000, 1_000_000]
+SINGLE_SAMPLE = 1_000  # per-row POSTs are timed on this many and extrapolated
+EXPRESSION = "price*qty*(1+tax)-discount"
+
+
+def make_columns(rows):
+    rng = random.Random(42)
+    return {
+        "price": [round(rng.uniform(1, 500), 2) for _ in range(rows)],
+        "qty": [rng.randint(1, 20) for _ in range(rows)],
+        "tax": [rng.choice([0.05, 0.12, 0.18]) for _ in range(rows)],
+        "discount": [rng.randint(0, 50) for _ in range(rows)],
+    }
+
+
+def bench_single(client, columns, rows):
+    start = time.perf_counter()
+    for i in range(rows):
+        expression = f"{columns['price'][i]}*{columns['qty'][i]}*(1+{columns['tax'][i]})-{columns['discount'][i]}"
+        client.post("/calculate", data={"expression": expression})
+    return time.perf_counter() - start
+
+
+def bench_batch(client, columns):
+    start = time.perf_counter()
+    response = client.post("/calculate/batch", json={"expression": EXPRESSION, "columns": columns})
+    assert response.status_code == 200, response.get_json()
+    return time.perf_counter() - start
+
+
+def run():
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app opens its log and history when imported; keep the bench's
+        # calculations out of the real files in the working directory
+        os.environ["CALC_LOG_FILE"] = os.path.join(tmp, "calculations.log")
+        os.environ["CALC_HISTORY_DB"] = os.path.join(tmp, "calculations.db")
+        from flask_calculator import app, calc_log
+
+        client = app.test_client()
+        sample = make_columns(SINGLE_SAMPLE)
+        per_row = bench_single(client, sample, SINGLE_SAMPLE) / SINGLE_SAMPLE
+
+        print(f"{'rows':>10}{'single POSTs (s)':>20}{'batch (s)':>12}{'rows/s single':>16}{'rows/s batch':>16}")
+        print("-" * 74)
+        for rows in SIZES:
+            columns = make_columns(rows)
+            single = per_row * rows
+            batch = bench_batch(client, columns)
+            note = "" if rows <= SINGLE_SAMPLE else " (est.)"
+            print(f"{rows:>10}{single:>12.2f}{note:<8}{batch:>12.3f}{rows / single:>16,.0f}{rows / batch:>16,.0f}")
+        calc_log.close()  # flush before the directory goes away
+
+
+if __name__ == "__main__":
+    run()
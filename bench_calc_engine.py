@@ -0,0 +1,48 @@
+# bench_calc_engine.py
+# Micro-benchmark: cold parse vs LRU cache hit in calc_engine
+# Run: python bench_calc_engine.py
+import time
+
+import calc_engine
+
+EXPRESSIONS = [
+    "12+7*3",
+    "(1500-250)/4",
+    "2**10-1",
+    "(3.5+4.25)*(12-7)/3",
+    "abs(-42)+sqrt(81)*round(7.6)",
+    "((100*1.18)-(100*0.05))/(12%5+1)",
+]
+ROUNDS = 20000
+
+
+def time_per_call(func, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def run():
+    print(f"{'Expression':<40}{'cold (us)':>12}{'hit (us)':>12}{'speedup':>10}")
+    print("-" * 74)
+    for expression in EXPRESSIONS:
+        def cold():
+            calc_engine.cache_clear()
+            calc_engine.evaluate(expression)
+
+        def hit():
+            calc_engine.evaluate(expression)
+
+        # cache_clear() itself is cheap, but measure it so it can be subtracted
+        overhead = time_per_call(calc_engine.cache_clear, ROUNDS)
+        cold_us = time_per_call(cold, ROUNDS) - overhead
+        calc_engine.evaluate(expression)
+        hit_us = time_per_call(hit, ROUNDS)
+        print(f"{expression:<40}{cold_us:>12.2f}{hit_us:>12.2f}{cold_us / hit_us:>9.1f}x")
+    print()
+    print(calc_engine.cache_info())
+
+
+if __name__ == "__main__":
+    run()
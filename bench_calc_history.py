@@ -0,0 +1,62 @@
+# bench_calc_history.py
+# Fills a throwaway history database and times /history-style queries
+# Run: python bench_calc_history.py [rows]
+import os
+import random
+import sys
+import tempfile
+import time
+
+from calc_history import CalculationHistory
+
+BATCH = 10_000
+
+
+def fill(history, rows):
+    rng = random.Random(7)
+    formulas = [f"{rng.randint(1, 999)}*{rng.randint(1, 99)}" for _ in range(500)]
+    # Spread rows evenly over the last 30 days
+    start = time.time() - 30 * 86400
+    step = 30 * 86400 / rows
+    for offset in range(0, rows, BATCH):
+        records = []
+        for i in range(offset, min(offset + BATCH, rows)):
+            expression = rng.choice(formulas)
+            records.append({"ts": start + i * step, "expression": expression, "result": i})
+        history.add_many(records)
+
+
+def timed(label, func, repeat=20):
+    func()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    ms = (time.perf_counter() - start) / repeat * 1000
+    print(f"{label:<45}{ms:>10.3f} ms")
+    return result
+
+
+def run(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        history = CalculationHistory(os.path.join(tmp, "history.db"))
+        try:
+            bench(history, rows)
+        finally:
+            history.close()
+
+
+def bench(history, rows):
+    start = time.perf_counter()
+    fill(history, rows)
+    print(f"Inserted {rows:,} rows in {time.perf_counter() - start:.1f}s\n")
+
+    hour_ago = time.time() - 3600
+    first = timed("last hour, first page (50)", lambda: history.query(since=hour_ago))
+    timed("last hour, second page (keyset)", lambda: history.query(since=hour_ago, cursor=first["next_cursor"]))
+    expression = first["items"][0]["expression"]
+    timed("one expression, last hour", lambda: history.query(since=hour_ago, expression=expression))
+    timed("newest 50, no filter", lambda: history.query())
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000)
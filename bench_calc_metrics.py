@@ -0,0 +1,58 @@
+# bench_calc_metrics.py
+# Per-request cost of the calc_metrics timing wrapper
+# Run: python bench_calc_metrics.py
+import threading
+import time
+
+from calc_metrics import Metrics
+
+CALLS = 500_000
+THREADS = 4
+
+
+def view():
+    return "OK"
+
+
+def error_view():
+    return "bad", 400
+
+
+def per_call_us(func, calls=CALLS):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def contended_us(func, threads=THREADS, calls=CALLS // THREADS):
+    workers = [threading.Thread(target=lambda: [func() for _ in range(calls)]) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - start) / (threads * calls) * 1e6
+
+
+def run():
+    metrics = Metrics()
+    timed_view = metrics.timed("view")(view)
+    timed_error = metrics.timed("error")(error_view)
+
+    base = per_call_us(view)
+    print(f"{'plain view':<36}{base:>8.3f} us")
+    for label, func in [("timed view", timed_view), ("timed view (400 status)", timed_error)]:
+        cost = per_call_us(func)
+        print(f"{label:<36}{cost:>8.3f} us   overhead {cost - base:.3f} us")
+    cost = contended_us(timed_view)
+    print(f"{f'timed view, {THREADS} threads':<36}{cost:>8.3f} us   overhead {cost - base:.3f} us")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        metrics.render()
+    print(f"{'render /metrics':<36}{(time.perf_counter() - start):>8.3f} ms")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,151 @@
+# bench_customer_store.py
+# Per-submission latency: old whole-workbook rewrite vs CustomerStore.add
+# at different table sizes. The Excel path is only run up to EXCEL_LIMIT
+# customers; past that a single rewrite takes minutes.
+# Also times the duplicate checks: the old linear `in df["Name"].values`
+# scan, the normalized unique-key lookup and the trigram fuzzy lookup,
+# and the customer table: styling the whole frame (old) vs one page.
+# Run: python bench_customer_store.py
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from customer_store import CustomerStore
+
+SIZES = [10_000, 100_000, 1_000_000]
+EXCEL_LIMIT = 10_000
+EXCEL_SUBMITS = 3
+STORE_SUBMITS = 500
+
+
+SYLLABLES = ["ra", "vi", "an", "ka", "pri", "ya", "su", "de", "mo", "ni", "sh", "ar", "ju", "me", "ta", "lo",
+             "ha", "ri", "go", "pa", "la", "ke", "dh", "ru", "si", "ma", "no", "te", "bh", "av"]
+LOOKUPS = 200
+
+
+def fake_name(i):
+    # Unique, varied "First Last" names: i is scrambled and written in
+    # base 30 with one syllable per digit
+    code = i * 7919 % 30 ** 5
+    digits = []
+    for _ in range(5):
+        code, digit = divmod(code, 30)
+        digits.append(SYLLABLES[digit])
+    return f"{''.join(digits[:2]).title()} {''.join(digits[2:]).title()}"
+
+
+def rows(n, start=0):
+    return [(fake_name(i), f"Father {i}", "MBA Marketing") for i in range(start, start + n)]
+
+
+def bench_excel(path, n):
+    pd.DataFrame(rows(n), columns=["Name", "Father Name", "Education"]).to_excel(path, index=False)
+    timings = []
+    for i in range(EXCEL_SUBMITS):
+        start = time.perf_counter()
+        # What python_Day1_challage.py used to do on every submission
+        df = pd.read_excel(path)
+        new_row = {"Name": f"New {i}", "Father Name": "F", "Education": "E"}
+        df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+        df.to_excel(path, index=False)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def median_ms(func, args):
+    timings = []
+    for arg in args:
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def bench_lookups(path, n):
+    store = CustomerStore(path, fuzzy=True)
+    for start in range(0, n, 100_000):
+        store.add_many(rows(min(100_000, n - start), start))
+    rng = random.Random(n)
+    names = [rows(1, rng.randrange(n))[0][0] for _ in range(LOOKUPS)]
+    typos = [name[:3] + name[4:] for name in names]  # one character dropped
+    values = store.to_frame()["Name"].values
+    scan = median_ms(lambda name: name in values, names[:20])
+    exact = median_ms(lambda name: store.exists(name.upper()), names)
+    fuzzy = median_ms(store.similar, typos)
+    # Share of typos whose original name is among the suggestions
+    found = sum(any(match == name for match, _ in store.similar(typo)) for typo, name in zip(typos, names))
+    store.close()
+    return scan, exact, fuzzy, found / len(names) * 100
+
+
+def bench_pages(path, n):
+    store = CustomerStore(path)
+    for start in range(0, n, 100_000):
+        store.add_many(rows(min(100_000, n - start), start))
+    style = {"background-color": "rgba(255,255,255,0.15)", "color": "white"}
+    # What the table used to cost on every rerun (HTML render of the Styler)
+    full = median_ms(lambda _: store.to_frame().style.set_properties(**style).to_html(), [0]) \
+        if n <= EXCEL_LIMIT else None
+
+    def deep_page(_):
+        cursor = None
+        for _ in range(20):
+            page, cursor = store.page(order="name", cursor=cursor)
+        return page
+
+    first = median_ms(lambda order: store.page(order=order)[0].style.set_properties(**style).to_html(),
+                      ["name", "newest"] * 10)
+    deep = median_ms(deep_page, range(5)) / 20
+    rng = random.Random(n)
+    prefixes = [rows(1, rng.randrange(n))[0][0][:4] for _ in range(LOOKUPS)]
+    search = median_ms(lambda prefix: (store.page(prefix), store.count(prefix)), prefixes)
+    store.close()
+    return full, first, deep, search
+
+
+def bench_store(path, n):
+    store = CustomerStore(path)
+    for start in range(0, n, 100_000):
+        store.add_many(rows(min(100_000, n - start), start))
+    timings = []
+    for i in range(STORE_SUBMITS):
+        start = time.perf_counter()
+        store.exists(f"New {i}")
+        store.add(f"New {i}", "F", "E")
+        timings.append(time.perf_counter() - start)
+    store.close()
+    timings.sort()
+    return statistics.median(timings) * 1000, timings[int(len(timings) * 0.99)] * 1000
+
+
+def run():
+    print(f"{'customers':>10}{'excel rewrite (ms)':>20}{'store p50 (ms)':>16}{'store p99 (ms)':>16}")
+    print("-" * 62)
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in SIZES:
+            excel = f"{bench_excel(os.path.join(tmp, f'{n}.xlsx'), n):>20.0f}" if n <= EXCEL_LIMIT else f"{'skipped':>20}"
+            p50, p99 = bench_store(os.path.join(tmp, f"{n}.db"), n)
+            print(f"{n:>10,}{excel}{p50:>16.3f}{p99:>16.3f}")
+
+        print()
+        print(f"{'customers':>10}{'linear scan (ms)':>18}{'unique key (ms)':>17}{'fuzzy (ms)':>12}{'found (%)':>11}")
+        print("-" * 68)
+        for n in SIZES:
+            scan, exact, fuzzy, found = bench_lookups(os.path.join(tmp, f"{n}-lookup.db"), n)
+            print(f"{n:>10,}{scan:>18.3f}{exact:>17.4f}{fuzzy:>12.3f}{found:>11.0f}")
+
+        print()
+        print(f"{'customers':>10}{'style all (ms)':>16}{'first page (ms)':>17}{'page 20 (ms)':>14}{'search (ms)':>13}")
+        print("-" * 70)
+        for n in SIZES:
+            full, first, deep, search = bench_pages(os.path.join(tmp, f"{n}-pages.db"), n)
+            full = f"{full:>16.0f}" if full is not None else f"{'skipped':>16}"
+            print(f"{n:>10,}{full}{first:>17.3f}{deep:>14.3f}{search:>13.3f}")
+
+
+if __name__ == "__main__":
+    run()
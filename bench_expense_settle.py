@@ -0,0 +1,77 @@
+# bench_expense_settle.py
+# Settlement benchmarks for expense_settle.py
+#   - the old debtor x creditor loop from python_Day2_challage.py vs settle()
+#     (the old loop is skipped above LEGACY_LIMIT people, it is O(D*C))
+#   - settle_exact() vs settle() transfer counts on small groups
+# Run: python bench_expense_settle.py
+import random
+import time
+
+from expense_settle import settle, settle_exact
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+LEGACY_LIMIT = 10_000
+EXACT_SIZES = [6, 10, 14, 16]
+
+
+def random_balances(n, seed=0):
+    rng = random.Random(seed)
+    paise = [rng.randint(-500_000, 500_000) for _ in range(n - 1)]
+    paise.append(-sum(paise))
+    return {f"person{i}": amount for i, amount in enumerate(paise)}
+
+
+def legacy_settle(balance):
+    # The loop that used to live in python_Day2_challage.py (rupees, floats)
+    creditors = {k: v for k, v in balance.items() if v > 0.01}
+    debtors = {k: -v for k, v in balance.items() if v < -0.01}
+    transactions = []
+    for debtor, owes in debtors.items():
+        for creditor, owed in creditors.items():
+            if owes > 0 and owed > 0:
+                transfer = min(owes, owed)
+                transactions.append({"From": debtor, "To": creditor, "Amount": transfer})
+                debtors[debtor] -= transfer
+                owes -= transfer
+                creditors[creditor] -= transfer
+                owed -= transfer
+                if owes <= 0.01:
+                    break
+    return transactions
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def run():
+    print(f"{'people':>10}{'legacy (s)':>14}{'heap (s)':>12}{'legacy transfers':>18}{'heap transfers':>16}")
+    print("-" * 70)
+    for n in SIZES:
+        balances = random_balances(n)
+        heap_s, transfers = timed(settle, balances)
+        if n <= LEGACY_LIMIT:
+            rupees = {p: v / 100 for p, v in balances.items()}
+            legacy_s, legacy = timed(legacy_settle, rupees)
+            legacy_cols = f"{legacy_s:>14.3f}", f"{len(legacy):>18,}"
+        else:
+            legacy_cols = f"{'skipped':>14}", f"{'-':>18}"
+        print(f"{n:>10,}{legacy_cols[0]}{heap_s:>12.3f}{legacy_cols[1]}{len(transfers):>16,}")
+
+    print()
+    print(f"{'people':>10}{'exact (s)':>12}{'exact transfers':>17}{'heap transfers':>16}")
+    print("-" * 55)
+    for n in EXACT_SIZES:
+        # Small round amounts, so zero-sum subgroups actually occur
+        rng = random.Random(n)
+        paise = [rng.choice([-3, -2, -1, 1, 2, 3]) * 10_000 for _ in range(n - 1)]
+        paise.append(-sum(paise))
+        balances = {f"person{i}": amount for i, amount in enumerate(paise)}
+        exact_s, exact = timed(settle_exact, balances)
+        print(f"{n:>10}{exact_s:>12.3f}{len(exact):>17}{len(settle(balances)):>16}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,125 @@
+# bench_expense_store.py
+# Time and memory of ExpenseStore vs the old list-of-dicts + pd.concat,
+# and the same rows through expense_db: a bulk load with the totals
+# rebuilt once by recompute_totals, then the group loaded back into an
+# ExpenseStore for export.
+# Run: python bench_expense_store.py [rows]
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from expense_db import ExpenseDB
+from expense_store import ExpenseStore
+
+LEGACY_ROWS = 2_000  # pd.concat per add is quadratic; timed on this many only
+PEOPLE = [f"person{i}" for i in range(50)]
+DB_CHUNK_ROWS = 5000  # expenses per transaction, as in expense_import
+
+
+def make_expenses(rows, seed=1):
+    rng = random.Random(seed)
+    start = datetime(2026, 1, 1)
+    for i in range(rows):
+        yield (
+            rng.choice(PEOPLE),
+            rng.randint(100, 500_000),
+            f"expense {i}",
+            start + timedelta(minutes=i),
+            rng.sample(PEOPLE, rng.randint(1, 5)),
+        )
+
+
+def legacy_add(rows):
+    expenses = []
+    df = pd.DataFrame(columns=["Paid By", "Amount", "Description", "Date", "Split Among"])
+    for paid_by, paise, desc, date, split in make_expenses(rows):
+        new_expense = {
+            "Paid By": paid_by,
+            "Amount": paise / 100,
+            "Description": desc,
+            "Date": date.strftime("%Y-%m-%d %H:%M"),
+            "Split Among": ", ".join(split),
+        }
+        expenses.append(new_expense)
+        df = pd.concat([df, pd.DataFrame([new_expense])], ignore_index=True)
+    return expenses, df
+
+
+def store_add(rows):
+    store = ExpenseStore()
+    for expense in make_expenses(rows):
+        store.append(*expense)
+    return store
+
+
+def measure(func, *args):
+    # Timed on its own first: tracemalloc slows allocation-heavy code a lot
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    result = func(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, current, peak
+
+
+def timed_ms(func):
+    func()  # warm-up
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def run(rows):
+    mb = 1024 * 1024
+    _, legacy_s, legacy_mem, _ = measure(legacy_add, LEGACY_ROWS)
+    print(f"legacy list + pd.concat, {LEGACY_ROWS:,} adds: {legacy_s:.2f}s "
+          f"({legacy_s / LEGACY_ROWS * 1e6:.0f} us/add, grows with row count), {legacy_mem / mb:.1f} MB retained")
+
+    store, store_s, store_mem, store_peak = measure(store_add, rows)
+    print(f"ExpenseStore, {rows:,} appends: {store_s:.2f}s ({store_s / rows * 1e6:.1f} us/add), "
+          f"{store_mem / mb:.1f} MB retained, {store_peak / mb:.1f} MB peak, {store.nbytes() / mb:.1f} MB in columns")
+
+    print(f"to_frame(latest 500 rows): {timed_ms(lambda: store.to_frame(start=len(store) - 500)):.2f} ms")
+    print(f"to_frame(all rows): {timed_ms(store.to_frame):.1f} ms")
+    print(f"to_frame(all rows, with Split Among for export): {timed_ms(lambda: store.to_frame(split_among=True)):.0f} ms")
+
+    bench_db(rows)
+
+
+def bench_db(rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        db = ExpenseDB(os.path.join(tmp, "expenses.db"))
+        group_id = db.group_id("bench")
+        expenses = make_expenses(rows)
+        start = time.perf_counter()
+        while True:
+            chunk = [e for _, e in zip(range(DB_CHUNK_ROWS), expenses)]
+            if not chunk:
+                break
+            db.add_expenses(group_id, chunk, update_totals=False)
+        load_s = time.perf_counter() - start
+        print(f"expense_db bulk load, {rows:,} expenses without per-expense totals: {load_s:.1f}s")
+
+        start = time.perf_counter()
+        db.recompute_totals(group_id)
+        print(f"recompute_totals (NumPy bincount over every split): {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        store = db.expense_store(group_id)
+        load_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        store.to_frame(split_among=True).to_csv(index=False)
+        print(f"expense_store(group): {load_ms:.0f} ms, then CSV export: {(time.perf_counter() - start) * 1000:.0f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
@@ -0,0 +1,34 @@
+# bench_score_async.py
+# Scrape MATCHES fixture match pages (score_fixture_site.py, each page
+# delayed PAGE_DELAY seconds) one at a time vs concurrently with
+# score_async.scrape_matches. With enough concurrency the total should be
+# close to the slowest single match, not the sum.
+# Run: python bench_score_async.py [matches]
+import asyncio
+import sys
+import time
+
+from score_async import scrape_matches
+from score_fixture_site import FixtureSite
+
+MATCHES = 20
+PAGE_DELAY = 1.0
+CONCURRENCY = [1, 5, 20]
+
+
+def run(matches=MATCHES):
+    print(f"{matches} match pages, each served in {PAGE_DELAY}s")
+    print(f"{'concurrency':>12}{'total (s)':>11}{'slowest (s)':>13}{'ok':>6}")
+    print("-" * 42)
+    with FixtureSite(page_delay=PAGE_DELAY) as site:
+        urls = [site.match_urls()[i % len(site.match_urls())] for i in range(matches)]
+        for concurrency in CONCURRENCY:
+            start = time.perf_counter()
+            results = asyncio.run(scrape_matches(urls, site=site.url, concurrency=concurrency))
+            total = time.perf_counter() - start
+            slowest = max(r.elapsed for r in results)
+            print(f"{concurrency:>12}{total:>11.2f}{slowest:>13.2f}{sum(r.ok for r in results):>6}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else MATCHES)
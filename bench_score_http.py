@@ -0,0 +1,60 @@
+# bench_score_http.py
+# Per-poll cost of the HTTP-first path vs the browser, against the local
+# fixture site (score_fixture_site.py):
+#   http     - fetch_score on a pooled keep-alive session (server-rendered page)
+#   browser  - ScoreWatcher(fast=True).poll on the same page
+#   fallback - HttpFirstWatcher on a page whose score is filled in by JS
+#              (HTTP finds an empty element, the browser takes over)
+# Run: python bench_score_http.py [polls]
+import statistics
+import sys
+import time
+
+from playwright.sync_api import Error as PlaywrightError
+
+from score_fixture_site import FixtureSite
+from score_http import HttpFirstWatcher, fetch_score, new_session
+from score_watcher import ScoreWatcher
+
+POLLS = 50
+
+
+def timed(func, polls):
+    func()  # warm-up: connection, browser start, match page
+    timings = []
+    for _ in range(polls):
+        start = time.perf_counter()
+        assert func(), "no score"
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run(polls=POLLS):
+    results = {}
+    with FixtureSite() as site:
+        session = new_session()
+        results["http"] = timed(lambda: fetch_score(site.match_url(), session), polls)
+        try:
+            with ScoreWatcher(site=site.url, fast=True) as watcher:
+                watcher.match_url = site.match_url()
+                results["browser"] = timed(watcher.poll, polls)
+        except PlaywrightError as e:
+            print(f"browser unavailable: {str(e).splitlines()[0]}")
+    with FixtureSite(render="js") as site:
+        try:
+            with HttpFirstWatcher(match_url=site.match_url(), site=site.url, fast=True) as watcher:
+                results["fallback"] = timed(watcher.poll, polls)
+                print(f"fallback: {watcher.http_polls} HTTP polls, {watcher.browser_polls} browser polls")
+        except PlaywrightError as e:
+            print(f"browser unavailable: {str(e).splitlines()[0]}")
+
+    print(f"{'path':<10}{'p50 per poll (ms)':>20}")
+    print("-" * 30)
+    for path, ms in results.items():
+        print(f"{path:<10}{ms:>20.2f}")
+    if "http" in results and "browser" in results:
+        print(f"HTTP-first is {results['browser'] / results['http']:.0f}x cheaper per poll")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else POLLS)
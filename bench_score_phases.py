@@ -0,0 +1,68 @@
+# bench_score_phases.py
+# Per-phase timing distributions of the score scraper over N runs against
+# the local fixture site (score_fixture_site.py), using score_trace:
+#   cron  - a fresh browser per run, search and all (the old cron job, minus its sleeps)
+#   watch - one ScoreWatcher kept open, N polls of the match page
+#   fast  - the same with request blocking
+#   http  - HttpFirstWatcher on the match URL (no browser while HTTP works)
+# Run: python bench_score_phases.py [runs] [--json]
+import json
+import sys
+
+from playwright.sync_api import Error as PlaywrightError
+
+from score_fixture_site import FixtureSite
+from score_http import HttpFirstWatcher
+from score_trace import Tracer
+from score_watcher import ScoreWatcher
+
+RUNS = 20
+MODES = ("cron", "watch", "fast", "http")
+
+
+def bench(site, mode, runs):
+    tracer = Tracer()
+    if mode == "cron":
+        for _ in range(runs):
+            with tracer.run("oneshot"):
+                with ScoreWatcher(site=site.url, tracer=tracer) as watcher:
+                    watcher.poll()
+    elif mode == "http":
+        with HttpFirstWatcher(match_url=site.match_url(), site=site.url, tracer=tracer) as watcher:
+            for _ in range(runs):
+                watcher.poll()
+    else:
+        with ScoreWatcher(site=site.url, fast=(mode == "fast"), tracer=tracer) as watcher:
+            watcher.poll()  # the match search happens once, like in watch mode
+            tracer.runs.clear()
+            for _ in range(runs):
+                watcher.poll()
+    return tracer.summary()
+
+
+def run(runs=RUNS, as_json=False):
+    results = {}
+    with FixtureSite() as site:
+        for mode in MODES:
+            try:
+                results[mode] = bench(site, mode, runs)
+            except PlaywrightError as e:
+                results[mode] = {"error": str(e).splitlines()[0]}
+    if as_json:
+        print(json.dumps(results, indent=2))
+        return
+    for mode, summary in results.items():
+        print(f"\n{mode} ({runs} runs)")
+        if "error" in summary:
+            print(f"  unavailable: {summary['error']}")
+            continue
+        print(f"  {'phase':<14}{'count':>7}{'p50 (ms)':>11}{'p95 (ms)':>11}{'max (ms)':>11}")
+        print("  " + "-" * 54)
+        for phase, s in sorted(summary.items(), key=lambda item: -item[1]["p50"]):
+            print(f"  {phase:<14}{s['count']:>7}{s['p50'] * 1000:>11.2f}{s['p95'] * 1000:>11.2f}"
+                  f"{s['max'] * 1000:>11.2f}")
+
+
+if __name__ == "__main__":
+    args = [a for a in sys.argv[1:] if a != "--json"]
+    run(int(args[0]) if args else RUNS, as_json="--json" in sys.argv)
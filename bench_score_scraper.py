@@ -0,0 +1,64 @@
+# bench_score_scraper.py
+# Match page load time against the local fixture site (score_fixture_site.py),
+# no network needed:
+#   networkidle - what playwright_demo.py used to do: full load, wait for networkidle
+#   watch       - ScoreWatcher: domcontentloaded + wait for the score text
+#   fast        - ScoreWatcher(fast=True): same, with images/fonts/CSS/third-party blocked
+# Every third-party (ad) response takes AD_DELAY seconds and a tracker keeps
+# beaconing, so networkidle often times out; those runs are counted.
+# Run: python bench_score_scraper.py [runs]
+import statistics
+import sys
+import time
+
+from playwright.sync_api import Error as PlaywrightError
+
+from score_fixture_site import AD_DELAY, FixtureSite
+from score_watcher import SCORE_SELECTOR, ScoreWatcher
+
+RUNS = 10
+NETWORKIDLE_TIMEOUT_MS = 15000
+
+
+def load_networkidle(watcher):
+    page = watcher.start()
+    page.goto(watcher.match_url)
+    page.wait_for_load_state("networkidle", timeout=NETWORKIDLE_TIMEOUT_MS)
+    return page.locator(SCORE_SELECTOR).first.inner_text().strip()
+
+
+def bench(site, mode, runs):
+    watcher = ScoreWatcher(site=site.url, fast=(mode == "fast"))
+    timings, timeouts = [], 0
+    with watcher:
+        watcher.find_match()
+        for _ in range(runs):
+            start = time.perf_counter()
+            try:
+                score = load_networkidle(watcher) if mode == "networkidle" else watcher.poll()
+                assert score, "empty score"
+                timings.append(time.perf_counter() - start)
+            except PlaywrightError:
+                timeouts += 1
+                watcher.recover()
+    return timings, timeouts, watcher.blocked
+
+
+def run(runs=RUNS):
+    print(f"fixture site: every third-party response delayed {AD_DELAY}s, {runs} loads per mode")
+    print(f"{'mode':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'timeouts':>10}{'blocked':>10}")
+    print("-" * 52)
+    with FixtureSite() as site:
+        for mode in ("networkidle", "watch", "fast"):
+            timings, timeouts, blocked = bench(site, mode, runs)
+            if timings:
+                timings.sort()
+                p50 = f"{statistics.median(timings) * 1000:>10.0f}"
+                p95 = f"{timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000:>10.0f}"
+            else:
+                p50 = p95 = f"{'-':>10}"
+            print(f"{mode:<12}{p50}{p95}{timeouts:>10}{blocked:>10}")
+
+
+if __name__ == "__main__":
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else RUNS)
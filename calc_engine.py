@@ -0,0 +1,260 @@
+# calc_engine.py
+# Safe server-side arithmetic for flask_calculator.py
+# Expressions are parsed with `ast` (never eval), checked against a small
+# whitelist and turned into a tree of plain Python closures. Compiled
+# expressions are kept in an LRU cache so a formula that is sent again
+# skips parsing completely.
+import ast
+import math
+import operator
+from functools import lru_cache, reduce
+
+try:
+    import numpy as np
+except ImportError:  # batch evaluation falls back to row-by-row
+    np = None
+
+# === LIMITS ===
+MAX_EXPRESSION_LENGTH = 1000
+MAX_POWER_EXPONENT = 1000
+MAX_INT_BITS = 4096
+CACHE_SIZE = 4096
+MAX_BATCH_ROWS = 2_000_000
+
+
+class CalcError(ValueError):
+    """Raised for expressions that cannot be parsed or evaluated."""
+
+
+def _safe_pow(base, exponent):
+    if abs(exponent) > MAX_POWER_EXPONENT:
+        raise CalcError("Exponent too large")
+    if isinstance(base, int) and isinstance(exponent, int):
+        if abs(base).bit_length() * abs(exponent) > MAX_INT_BITS:
+            raise CalcError("Result too large")
+    return operator.pow(base, exponent)
+
+
+BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _safe_pow,
+}
+
+UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "sqrt": math.sqrt,
+}
+
+# Same operators for whole NumPy columns at once
+if np is not None:
+    def _vector_pow(base, exponent):
+        # In float64, like the columns: np.power on two Python ints works in
+        # int64, which wraps (2**64 -> 0) and rejects negative exponents
+        return np.power(np.asarray(base, dtype=float), np.asarray(exponent, dtype=float))
+
+    VECTOR_BINARY_OPS = {**BINARY_OPS, ast.Pow: _vector_pow}
+    VECTOR_FUNCTIONS = {
+        "abs": np.abs,
+        "round": np.round,
+        "min": lambda *args: reduce(np.minimum, args),
+        "max": lambda *args: reduce(np.maximum, args),
+        "sqrt": np.sqrt,
+    }
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+}
+
+
+# === COMPILER ===
+def _compile_node(node, names, vectorized=False):
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise CalcError(f"Unsupported literal: {value!r}")
+        return lambda env: value
+
+    if isinstance(node, ast.BinOp):
+        op = (VECTOR_BINARY_OPS if vectorized else BINARY_OPS).get(type(node.op))
+        if op is None:
+            raise CalcError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, names, vectorized)
+        right = _compile_node(node.right, names, vectorized)
+        return lambda env: op(left(env), right(env))
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise CalcError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, names, vectorized)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda env: value
+        names.add(name)
+        return lambda env: env[name]
+
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise CalcError("Unsupported function call")
+        func = (VECTOR_FUNCTIONS if vectorized else FUNCTIONS)[node.func.id]
+        args = tuple(_compile_node(arg, names, vectorized) for arg in node.args)
+        return lambda env: func(*(arg(env) for arg in args))
+
+    raise CalcError(f"Unsupported syntax: {type(node).__name__}")
+
+
+class CompiledExpression:
+    """A parsed expression that can be evaluated many times."""
+
+    __slots__ = ("source", "names", "_func")
+
+    def __init__(self, source, func, names):
+        self.source = source
+        self.names = names
+        self._func = func
+
+    def evaluate(self, variables=None):
+        env = variables or {}
+        missing = self.names.difference(env)
+        if missing:
+            raise CalcError(f"Unknown name(s): {', '.join(sorted(missing))}")
+        try:
+            result = self._func(env)
+        except ZeroDivisionError:
+            raise CalcError("Division by zero") from None
+        except (OverflowError, ValueError, TypeError, RecursionError) as e:
+            raise CalcError(str(e)) from None
+        if isinstance(result, complex):
+            raise CalcError("Result is not a real number")
+        if isinstance(result, float) and not math.isfinite(result):
+            raise CalcError("Result is not a finite number")
+        if isinstance(result, int) and result.bit_length() > MAX_INT_BITS:
+            raise CalcError("Result too large")
+        return result
+
+    def __repr__(self):
+        return f"CompiledExpression({self.source!r})"
+
+
+def normalize(expression):
+    # The UI shows × for multiply
+    return expression.replace("×", "*").strip()
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compile_cached(source, vectorized=False):
+    try:
+        tree = ast.parse(source, mode="eval")
+    except (SyntaxError, RecursionError):
+        raise CalcError(f"Invalid expression: {source!r}") from None
+    names = set()
+    try:
+        func = _compile_node(tree.body, names, vectorized)
+    except RecursionError:
+        raise CalcError("Expression is nested too deeply") from None
+    return CompiledExpression(source, func, frozenset(names))
+
+
+def compile_expression(expression, vectorized=False):
+    source = normalize(expression)
+    if not source:
+        raise CalcError("Empty expression")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise CalcError("Expression too long")
+    return _compile_cached(source, vectorized)
+
+
+def evaluate(expression, variables=None):
+    return compile_expression(expression).evaluate(variables)
+
+
+# === BATCH ===
+def evaluate_many(expressions):
+    """Evaluate independent expressions; returns (result, error) per item."""
+    if len(expressions) > MAX_BATCH_ROWS:
+        raise CalcError("Too many expressions")
+    out = []
+    for expression in expressions:
+        try:
+            out.append((evaluate(str(expression)), None))
+        except CalcError as e:
+            out.append((None, str(e)))
+    return out
+
+
+def _check_columns(compiled, columns):
+    missing = compiled.names.difference(columns)
+    if missing:
+        raise CalcError(f"Missing column(s): {', '.join(sorted(missing))}")
+    lengths = {len(columns[name]) for name in compiled.names}
+    if len(lengths) > 1:
+        raise CalcError("Columns must all have the same length")
+    rows = lengths.pop() if lengths else 1
+    if rows > MAX_BATCH_ROWS:
+        raise CalcError("Too many rows")
+    return rows
+
+
+def evaluate_columns(expression, columns):
+    """Evaluate one expression template against columns of variable values.
+
+    Uses NumPy to evaluate whole columns at once when it is installed.
+    Returns a list with one result per row, None where the row failed
+    (division by zero, overflow, non-numeric input).
+    """
+    compiled = compile_expression(expression)
+    rows = _check_columns(compiled, columns)
+
+    if np is None:
+        return _evaluate_rows(compiled, columns, rows)
+
+    vector = compile_expression(expression, vectorized=True)
+    try:
+        arrays = {name: np.asarray(columns[name], dtype=float) for name in vector.names}
+    except (TypeError, ValueError):
+        # Non-numeric cells: let the row-by-row path report them individually
+        return _evaluate_rows(compiled, columns, rows)
+    with np.errstate(all="ignore"):
+        values = np.broadcast_to(np.asarray(vector.evaluate(arrays), dtype=float), (rows,))
+    results = values.tolist()
+    for i in np.flatnonzero(~np.isfinite(values)).tolist():
+        results[i] = None
+    return results
+
+
+def _evaluate_rows(compiled, columns, rows):
+    names = sorted(compiled.names)
+    results = []
+    for i in range(rows):
+        try:
+            env = {name: float(columns[name][i]) for name in names}
+            results.append(compiled.evaluate(env))
+        except (CalcError, TypeError, ValueError):
+            results.append(None)
+    return results
+
+
+def cache_info():
+    return _compile_cached.cache_info()
+
+
+def cache_clear():
+    _compile_cached.cache_clear()
@@ -0,0 +1,154 @@
+# calc_history.py
+# SQLite calculation history for flask_calculator.py
+# Rows arrive in batches from the calc_log writer thread (one transaction
+# per batch) and are read back newest-first with keyset pagination, so a
+# page never scans or skips over the rows before it.
+# The log drops records when its queue is full rather than slow requests
+# down, so under heavy load some calculations never reach the history;
+# count_dropped (wired to the log's on_drop) keeps the tally for /metrics.
+import sqlite3
+import threading
+import time
+
+DB_FILE = "calculations.db"
+MAX_PAGE_SIZE = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calculations (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    expression TEXT NOT NULL,
+    result NUMERIC,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_calculations_ts ON calculations (ts);
+CREATE INDEX IF NOT EXISTS idx_calculations_expression_ts ON calculations (expression, ts);
+"""
+
+INSERT_SQL = "INSERT INTO calculations (ts, expression, result, error) VALUES (?, ?, ?, ?)"
+INT64_MAX = 2 ** 63 - 1
+
+
+def _result_value(result):
+    # SQLite integers are 64-bit; bigger results are stored as REAL
+    if isinstance(result, int) and not -INT64_MAX - 1 <= result <= INT64_MAX:
+        try:
+            return float(result)
+        except OverflowError:
+            return None
+    return result
+
+
+class CalculationHistory:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # sqlite3 connections are per thread: the log writer inserts,
+        # request threads read
+        self._local = threading.local()
+        self.dropped = 0  # calculations that never reached the table
+        self._drop_lock = threading.Lock()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # === WRITE ===
+    def add_many(self, records):
+        rows = [
+            (r.get("ts", time.time()), r["expression"], _result_value(r.get("result")), r.get("error"))
+            for r in records
+            if _is_calculation(r)
+        ]
+        if not rows:
+            return 0
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(INSERT_SQL, rows)
+            return len(rows)
+        except (sqlite3.InterfaceError, sqlite3.ProgrammingError, OverflowError, ValueError):
+            pass
+        # One row SQLite can't bind; insert the rest one by one rather than lose the batch
+        added = 0
+        with conn:
+            for row in rows:
+                try:
+                    conn.execute(INSERT_SQL, row)
+                    added += 1
+                except (sqlite3.InterfaceError, sqlite3.ProgrammingError, OverflowError, ValueError) as e:
+                    print(f"calc_history: row skipped: {e}")
+        return added
+
+    def count_dropped(self, records):
+        """Count records the log dropped that would have been stored."""
+        n = sum(1 for r in records if _is_calculation(r))
+        with self._drop_lock:
+            self.dropped += n
+
+    def add(self, expression, result=None, error=None, ts=None):
+        return self.add_many([{"ts": ts or time.time(), "expression": expression, "result": result, "error": error}])
+
+    # === READ ===
+    def query(self, limit=50, since=None, until=None, expression=None, cursor=None):
+        """Newest-first page of calculations.
+
+        `cursor` is the `next_cursor` of the previous page. Every filter is
+        served by either the (ts) or the (expression, ts) index.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        where, params = [], []
+        if expression is not None:
+            where.append("expression = ?")
+            params.append(expression)
+        if since is not None:
+            where.append("ts >= ?")
+            params.append(float(since))
+        if until is not None:
+            where.append("ts < ?")
+            params.append(float(until))
+        if cursor:
+            cursor_ts, cursor_id = parse_cursor(cursor)
+            where.append("(ts, id) < (?, ?)")
+            params.extend([cursor_ts, cursor_id])
+
+        sql = "SELECT id, ts, expression, result, error FROM calculations"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY ts DESC, id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = [dict(row) for row in self._connect().execute(sql, params)]
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1]['ts']!r}:{rows[-1]['id']}"
+        return {"items": rows, "next_cursor": next_cursor}
+
+    def count(self):
+        return self._connect().execute("SELECT COUNT(*) FROM calculations").fetchone()[0]
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _is_calculation(record):
+    # Batch summary lines are logged too, but aren't history rows
+    return "expression" in record and "batch" not in record
+
+
+def parse_cursor(cursor):
+    try:
+        ts, row_id = cursor.split(":")
+        return float(ts), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from None
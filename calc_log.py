@@ -0,0 +1,194 @@
+# calc_log.py
+# Structured (JSON lines) calculation log for flask_calculator.py
+# Request handlers only put a record on a bounded queue. A background
+# thread drains the queue in batches, writes each batch with a single
+# write + flush (group commit) and rotates the file by size. Each batch is
+# also handed to any `sinks` (e.g. calc_history) from the same thread.
+# Records dropped before the sinks see them (queue full, can't be
+# serialized) are passed to `on_drop`, so a sink can count what it missed.
+import atexit
+import json
+import os
+import queue
+import threading
+import time
+
+# === DEFAULTS ===
+LOG_FILE = "calculations.log"
+QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.2  # seconds a record may wait before being written
+MAX_BYTES = 10 * 1024 * 1024
+BACKUP_COUNT = 5
+
+# What to do when the queue is full:
+#   "drop"  - discard the new record and count it (never slows a request)
+#   "block" - wait up to block_timeout for space, then drop
+POLICIES = ("drop", "block")
+
+_STOP = object()
+
+
+class CalculationLog:
+    def __init__(self, path=LOG_FILE, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, max_bytes=MAX_BYTES, backup_count=BACKUP_COUNT,
+                 policy="drop", block_timeout=0.05, fsync=False, sinks=(), on_drop=None):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.fsync = fsync
+        self.sinks = list(sinks)
+        self.on_drop = on_drop
+
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._drop_lock = threading.Lock()
+        self._file = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="calc-log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # === PRODUCER SIDE (request handlers) ===
+    def log(self, **fields):
+        if self._closed:
+            return False
+        fields.setdefault("ts", time.time())
+        try:
+            if self.policy == "block":
+                self._queue.put(fields, timeout=self.block_timeout)
+            else:
+                self._queue.put_nowait(fields)
+            return True
+        except queue.Full:
+            self._drop([fields])
+            return False
+
+    def _count_dropped(self, n):
+        with self._drop_lock:
+            self.dropped += n
+
+    def _drop(self, records):
+        self._count_dropped(len(records))
+        if self.on_drop:
+            try:
+                self.on_drop(records)
+            except Exception as e:
+                print(f"calc_log: on_drop {self.on_drop!r} failed: {e}")
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+    def close(self, timeout=5):
+        if self._closed:
+            return
+        self._closed = True
+        if not self._thread.is_alive():
+            return
+        # The writer keeps draining while we wait for space; if it is stuck,
+        # give up rather than hang the process at exit
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("calc_log: writer not draining, records still queued are lost")
+            return
+        self._thread.join(timeout)
+
+    # === WRITER THREAD ===
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                pass
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    # Whatever goes wrong with one batch, keep the writer alive
+                    self._count_dropped(len(batch))
+                    print(f"calc_log: batch failed: {e}")
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def _write_batch(self, batch):
+        lines = []
+        good = []
+        for record in batch:
+            try:
+                lines.append(json.dumps(record, default=str) + "\n")
+                good.append(record)
+            except (TypeError, ValueError) as e:
+                # e.g. an int too long to print; drop that record, not the batch
+                self._drop([record])
+                print(f"calc_log: record dropped: {e}")
+        batch = good
+        if not batch:
+            return
+        data = "".join(lines)
+        try:
+            f = self._open()
+            f.write(data)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.written += len(batch)
+            self.batches += 1
+            if f.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError as e:
+            # Never kill the writer thread over a disk problem
+            self._count_dropped(len(batch))
+            print(f"calc_log: write failed: {e}")
+        for sink in self.sinks:
+            try:
+                sink(batch)
+            except Exception as e:
+                print(f"calc_log: sink {sink!r} failed: {e}")
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        # calculations.log.4 -> .5, ..., calculations.log -> .1
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
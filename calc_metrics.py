@@ -0,0 +1,117 @@
+# calc_metrics.py
+# Request metrics for flask_calculator.py, exposed in Prometheus text format
+# Views are wrapped with `metrics.timed("route")` instead of Flask
+# before/after_request hooks: one perf_counter pair, one bisect and one
+# lock per request keeps the overhead at a few microseconds.
+# Note: with gunicorn every worker process has its own counters.
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Upper bounds in seconds; the last bucket (+Inf) is implicit
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RouteStats:
+    __slots__ = ("requests", "errors", "buckets", "total_seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.total_seconds = 0.0
+
+
+class Metrics:
+    def __init__(self, prefix="calculator"):
+        self.prefix = prefix
+        self.routes = {}
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._gauges = []
+
+    def timed(self, route):
+        stats = self.routes.setdefault(route, RouteStats())
+        lock = self._lock
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                with lock:
+                    self.in_flight += 1
+                start = time.perf_counter()
+                failed = True
+                try:
+                    response = view(*args, **kwargs)
+                    failed = _status_of(response) >= 400
+                    return response
+                finally:
+                    elapsed = time.perf_counter() - start
+                    bucket = bisect_left(BUCKETS, elapsed)
+                    with lock:
+                        self.in_flight -= 1
+                        stats.requests += 1
+                        stats.errors += failed
+                        stats.buckets[bucket] += 1
+                        stats.total_seconds += elapsed
+            return wrapper
+        return decorator
+
+    def gauge(self, name, help_text, func, kind="gauge"):
+        """Register a value read at scrape time, e.g. a queue length.
+
+        Use kind="counter" for values that only go up.
+        """
+        self._gauges.append((name, help_text, func, kind))
+
+    def render(self):
+        p = self.prefix
+        with self._lock:
+            snapshot = {
+                route: (s.requests, s.errors, list(s.buckets), s.total_seconds)
+                for route, s in self.routes.items()
+            }
+            in_flight = self.in_flight
+
+        lines = [
+            f"# HELP {p}_requests_total Requests handled, by route.",
+            f"# TYPE {p}_requests_total counter",
+        ]
+        lines += [f'{p}_requests_total{{route="{r}"}} {v[0]}' for r, v in snapshot.items()]
+        lines += [
+            f"# HELP {p}_request_errors_total Requests that raised or returned a 4xx/5xx status, by route.",
+            f"# TYPE {p}_request_errors_total counter",
+        ]
+        lines += [f'{p}_request_errors_total{{route="{r}"}} {v[1]}' for r, v in snapshot.items()]
+        lines += [
+            f"# HELP {p}_request_duration_seconds Time spent in the view function, by route.",
+            f"# TYPE {p}_request_duration_seconds histogram",
+        ]
+        for route, (requests, _, buckets, total) in snapshot.items():
+            cumulative = 0
+            for bound, count in zip(BUCKETS, buckets):
+                cumulative += count
+                lines.append(f'{p}_request_duration_seconds_bucket{{route="{route}",le="{bound}"}} {cumulative}')
+            lines.append(f'{p}_request_duration_seconds_bucket{{route="{route}",le="+Inf"}} {requests}')
+            lines.append(f'{p}_request_duration_seconds_sum{{route="{route}"}} {total}')
+            lines.append(f'{p}_request_duration_seconds_count{{route="{route}"}} {requests}')
+        lines += [
+            f"# HELP {p}_requests_in_flight Requests currently being handled.",
+            f"# TYPE {p}_requests_in_flight gauge",
+            f"{p}_requests_in_flight {in_flight}",
+        ]
+        for name, help_text, func, kind in self._gauges:
+            lines += [
+                f"# HELP {p}_{name} {help_text}",
+                f"# TYPE {p}_{name} {kind}",
+                f"{p}_{name} {func()}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _status_of(response):
+    # Views return a Response, a body, or a (body, status) tuple
+    if isinstance(response, tuple):
+        return response[1] if len(response) > 1 and isinstance(response[1], int) else 200
+    return getattr(response, "status_code", 200)
@@ -0,0 +1,135 @@
+# customer_export.py
+# Customer exports for python_Day1_challage.py (CSV, gzipped CSV, Parquet, Excel)
+# Nothing is built until someone actually downloads. Each export is
+# written chunk by chunk straight from SQLite to a file named after the
+# data version (max customer id), so memory stays at one chunk and a
+# second download of unchanged data is just a file read. Files are
+# written to a temp name and renamed into place, so concurrent sessions
+# never see half an export.
+import gzip
+import importlib.util
+import os
+import re
+import tempfile
+
+from customer_store import COLUMNS
+
+EXPORT_DIR = os.environ.get("CUSTOMER_EXPORT_DIR", "exports")
+CHUNK_ROWS = 50_000
+READ_ATTEMPTS = 3
+
+# fmt -> (label, file extension, MIME type)
+FORMATS = {
+    "csv": ("CSV", "csv", "text/csv"),
+    "csv.gz": ("CSV (gzip)", "csv.gz", "application/gzip"),
+    "parquet": ("Parquet", "parquet", "application/vnd.apache.parquet"),
+    "xlsx": ("Excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def available_formats():
+    """Formats whose optional dependency is installed (Parquet needs pyarrow)."""
+    formats = ["csv", "csv.gz"]
+    if importlib.util.find_spec("pyarrow"):
+        formats.append("parquet")
+    if importlib.util.find_spec("openpyxl"):
+        formats.append("xlsx")
+    return formats
+
+
+def export_path(fmt, version, directory=EXPORT_DIR):
+    return os.path.join(directory, f"customers-v{version}.{FORMATS[fmt][1]}")
+
+
+def export(store, fmt, directory=EXPORT_DIR, chunk_rows=CHUNK_ROWS):
+    """Path of an up-to-date export in `fmt`, writing it only if this version has none yet."""
+    if fmt not in FORMATS:
+        raise ValueError(f"fmt must be one of {list(FORMATS)}")
+    version = store.version()
+    path = export_path(fmt, version, directory)
+    if os.path.exists(path):
+        return path
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".export-", suffix="." + FORMATS[fmt][1])
+    os.close(fd)
+    try:
+        WRITERS[fmt](tmp, store.iter_frames(chunk_rows, upto=version))
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+    _remove_old_versions(fmt, version, directory)
+    return path
+
+
+def read_export(store, fmt, directory=EXPORT_DIR):
+    """Bytes of the current export, for st.download_button(data=callable)."""
+    for attempt in range(READ_ATTEMPTS):
+        try:
+            with open(export(store, fmt, directory), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            # Another session wrote a newer version and removed this one
+            # in between; export() again picks up (or writes) the newest
+            if attempt == READ_ATTEMPTS - 1:
+                raise
+
+
+def _remove_old_versions(fmt, version, directory):
+    # Only older versions: a session exporting stale data must not delete
+    # a newer file another session just wrote
+    pattern = re.compile(rf"customers-v(\d+)\.{re.escape(FORMATS[fmt][1])}")
+    for name in os.listdir(directory):
+        match = pattern.fullmatch(name)
+        if match and int(match.group(1)) < version:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass  # another session cleaned it up first
+
+
+# === WRITERS ===
+def _write_csv(path, frames):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        _csv_chunks(f, frames)
+
+
+def _write_csv_gz(path, frames):
+    with gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=6) as f:
+        _csv_chunks(f, frames)
+
+
+def _csv_chunks(f, frames):
+    header = True
+    for frame in frames:
+        frame.to_csv(f, index=False, header=header)
+        header = False
+    if header:
+        f.write(",".join(COLUMNS) + "\n")
+
+
+def _write_parquet(path, frames):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+    # One row group per chunk
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for frame in frames:
+            writer.write_table(pa.Table.from_pandas(frame, schema=schema, preserve_index=False))
+
+
+def _write_xlsx(path, frames):
+    from openpyxl import Workbook
+
+    # write_only streams rows to disk instead of building the sheet in memory
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Customers")
+    sheet.append(COLUMNS)
+    for frame in frames:
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(path)
+
+
+WRITERS = {"csv": _write_csv, "csv.gz": _write_csv_gz, "parquet": _write_parquet, "xlsx": _write_xlsx}
@@ -0,0 +1,75 @@
+# customer_import.py
+# Bulk import of customers from CSV / Excel files into customer_store
+# Same rules as the form in python_Day1_challage.py (all three fields
+# required, surrounding spaces trimmed, no duplicate names) but applied
+# with pandas string ops to a whole chunk at a time. Duplicates are
+# checked against the file itself and, with one indexed query per chunk,
+# against existing customers. Each chunk's good rows go in one
+# transaction.
+import pandas as pd
+
+import file_import
+from customer_store import COLUMNS, DuplicateCustomer
+from file_import import CHUNK_ROWS, ImportResult, iter_chunks, text_column
+
+# Header names partners use for each field
+SYNONYMS = {
+    "Name": ["name", "customer", "customer name", "full name", "client", "client name"],
+    "Father Name": ["father name", "father's name", "fathers name", "father_name", "father", "guardian",
+                    "guardian name"],
+    "Education": ["education", "qualification", "highest qualification", "degree"],
+}
+
+
+def guess_mapping(columns):
+    """Which file column holds each customer field, by header name."""
+    return file_import.guess_mapping(columns, COLUMNS, SYNONYMS)
+
+
+def validate_chunk(store, chunk, mapping):
+    """Clean one chunk.
+
+    Returns (rows, rejected) where rows are (name, father_name, education)
+    tuples ready for CustomerStore.add_each and rejected is a Series of
+    reasons indexed by the chunk's row index. Earlier chunks are already
+    committed, so they are covered by the existing-customer check.
+    """
+    name = text_column(chunk, mapping.get("Name"))
+    father_name = text_column(chunk, mapping.get("Father Name"))
+    education = text_column(chunk, mapping.get("Education"))
+    keys = store.dedup_keys(name, father_name)
+
+    missing = (name == "") | (father_name == "") | (education == "")
+    reasons = pd.Series(pd.NA, index=chunk.index, dtype="string")
+    reasons = reasons.mask(missing, "missing name, father name or education")
+    candidates = ~missing
+    in_file = candidates & keys.mask(~candidates).duplicated(keep="first")
+    reasons = reasons.mask(in_file, "duplicate name in file")
+    candidates &= ~in_file
+    existing = store.existing_keys(keys[candidates].unique())
+    reasons = reasons.mask(candidates & keys.isin(existing), "already registered")
+    ok = reasons.isna()
+    rows = list(zip(name[ok], father_name[ok], education[ok]))
+    return rows, reasons[~ok]
+
+
+def import_customers(store, file, filename, mapping, chunk_rows=CHUNK_ROWS, progress=None):
+    """Stream a CSV/XLSX file into the store; `progress(fraction, result)` is called per chunk."""
+    unmapped = [field for field in COLUMNS if mapping.get(field) is None]
+    if unmapped:
+        raise ValueError(f"Map a column for {', '.join(unmapped)}")
+    result = ImportResult()
+    for chunk, fraction in iter_chunks(file, filename, chunk_rows):
+        rows, rejected = validate_chunk(store, chunk, mapping)
+        result.reject(rejected.index.tolist(), rejected.tolist())
+        if rows:
+            # Someone may have registered one of these names through the
+            # form since the check; add_each rejects just those rows
+            accepted = chunk.index.difference(rejected.index).tolist()
+            clashes = [row for row, outcome in zip(accepted, store.add_each(rows))
+                       if isinstance(outcome, DuplicateCustomer)]
+            result.imported += len(rows) - len(clashes)
+            result.reject(clashes, ["already registered"] * len(clashes))
+        if progress:
+            progress(fraction, result)
+    return result
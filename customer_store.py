@@ -0,0 +1,365 @@
+# customer_store.py
+# Append-only customer storage for python_Day1_challage.py
+# Each new customer is one INSERT into a WAL-mode SQLite file instead of
+# rewriting the whole customers.xlsx; the Excel file is only produced
+# when someone asks for an export.
+#
+# Duplicates are caught by a UNIQUE index on a normalized key (case and
+# extra spaces ignored), kept in the same transaction as the insert.
+# With fuzzy=True a trigram index is maintained as well, for "did you
+# mean" near-duplicate lookups.
+import math
+import os
+import sqlite3
+import threading
+import unicodedata
+from datetime import datetime
+
+import pandas as pd
+
+DB_FILE = "customers.db"
+COLUMNS = ["Name", "Father Name", "Education"]
+UNIQUE_MODES = ("name", "name_father")
+FUZZY_THRESHOLD = 0.5
+MAX_POSTINGS = 20_000  # index entries read per fuzzy lookup
+MAX_CANDIDATES = 50     # names scored per fuzzy lookup
+PAGE_SIZE = 50
+EXPORT_CHUNK_ROWS = 50_000
+# Sort orders for page(): (ORDER BY columns, keyset columns, direction)
+ORDERS = {
+    "name": ("name_key, id", "(name_key, id)", ">"),
+    "newest": ("id DESC", "(id)", "<"),
+    "oldest": ("id", "(id)", ">"),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS customers (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    father_name TEXT NOT NULL,
+    education TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_customers_name ON customers (name);
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS customer_trigrams (
+    trigram TEXT NOT NULL,
+    customer_id INTEGER NOT NULL,
+    PRIMARY KEY (trigram, customer_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trigram_counts (
+    trigram TEXT PRIMARY KEY,
+    n INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Added to databases created before the normalized keys existed
+KEY_COLUMNS = ["name_key TEXT", "dedup_key TEXT"]
+
+INSERT_SQL = ("INSERT INTO customers (name, father_name, education, created, name_key, dedup_key) "
+              "VALUES (?, ?, ?, ?, ?, ?)")
+
+SELECT_FRAME = 'SELECT name AS "Name", father_name AS "Father Name", education AS "Education" FROM customers'
+
+
+class DuplicateCustomer(ValueError):
+    """Raised when a customer with the same normalized key already exists."""
+
+
+def normalize(text):
+    """Case-insensitive, whitespace-insensitive form of a name."""
+    return " ".join(unicodedata.normalize("NFKC", str(text)).casefold().split())
+
+
+def normalize_series(series):
+    """normalize() over a whole pandas Series of strings."""
+    return series.str.normalize("NFKC").str.casefold().str.split().str.join(" ")
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class CustomerStore:
+    def __init__(self, path=DB_FILE, unique_on="name", fuzzy=False):
+        if unique_on not in UNIQUE_MODES:
+            raise ValueError(f"unique_on must be one of {UNIQUE_MODES}")
+        self.path = path
+        self.unique_on = unique_on
+        self.fuzzy = fuzzy
+        self._local = threading.local()
+        self._migrate()
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # === SCHEMA / KEYS ===
+    def _migrate(self):
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(customers)")}
+        with conn:
+            for column in KEY_COLUMNS:
+                if column.split()[0] not in existing:
+                    conn.execute(f"ALTER TABLE customers ADD COLUMN {column}")
+        stored_mode = conn.execute("SELECT value FROM settings WHERE key = 'unique_on'").fetchone()
+        if stored_mode is None or stored_mode[0] != self.unique_on or \
+                conn.execute("SELECT 1 FROM customers WHERE name_key IS NULL LIMIT 1").fetchone():
+            self._rebuild_keys()
+        if self.fuzzy and not conn.execute("SELECT 1 FROM customer_trigrams LIMIT 1").fetchone() and self.count():
+            self._rebuild_trigrams()
+
+    def _keys(self, name, father_name):
+        name_key = normalize(name)
+        if self.unique_on == "name_father":
+            return name_key, f"{name_key}\x1f{normalize(father_name)}"
+        return name_key, name_key
+
+    def dedup_keys(self, names, father_names):
+        """Vectorized _keys(): the dedup key for each row of two string Series."""
+        keys = normalize_series(names)
+        if self.unique_on == "name_father":
+            keys = keys + "\x1f" + normalize_series(father_names)
+        return keys
+
+    def _rebuild_keys(self):
+        # Existing duplicates are kept, but only the first of each gets the
+        # unique key (NULLs never clash in a UNIQUE index)
+        conn = self._connect()
+        with conn:
+            conn.execute("DROP INDEX IF EXISTS idx_customers_dedup")
+            seen = set()
+            updates = []
+            for row_id, name, father_name in conn.execute("SELECT id, name, father_name FROM customers ORDER BY id"):
+                name_key, dedup_key = self._keys(name, father_name)
+                updates.append((name_key, None if dedup_key in seen else dedup_key, row_id))
+                seen.add(dedup_key)
+            conn.executemany("UPDATE customers SET name_key = ?, dedup_key = ? WHERE id = ?", updates)
+            conn.execute("CREATE UNIQUE INDEX idx_customers_dedup ON customers (dedup_key)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_name_key ON customers (name_key)")
+            conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('unique_on', ?)", (self.unique_on,))
+
+    def _rebuild_trigrams(self):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM customer_trigrams")
+            conn.execute("DELETE FROM trigram_counts")
+            rows = conn.execute("SELECT id, name_key FROM customers").fetchall()
+            self._index_trigrams(conn, rows)
+
+    def _index_trigrams(self, conn, rows):
+        postings = [(gram, row_id) for row_id, name_key in rows for gram in trigrams(name_key)]
+        conn.executemany("INSERT OR IGNORE INTO customer_trigrams (trigram, customer_id) VALUES (?, ?)", postings)
+        counts = {}
+        for gram, _ in postings:
+            counts[gram] = counts.get(gram, 0) + 1
+        conn.executemany("INSERT INTO trigram_counts (trigram, n) VALUES (?, ?) "
+                         "ON CONFLICT (trigram) DO UPDATE SET n = n + excluded.n", counts.items())
+
+    # === WRITE ===
+    def add(self, name, father_name, education):
+        return self.add_many([(name, father_name, education)])[0]
+
+    def add_many(self, rows):
+        """Append (name, father_name, education) rows in one transaction; returns their ids.
+
+        Raises DuplicateCustomer (and inserts nothing) if any row clashes
+        with an existing customer or another row in the batch.
+        """
+        conn = self._connect()
+        with conn:
+            results = self._insert(conn, rows)
+            for result in results:
+                if isinstance(result, DuplicateCustomer):
+                    raise result
+        return results
+
+    def add_each(self, rows):
+        """Like add_many, but duplicates only reject their own row.
+
+        Returns one result per row: the new id, or a DuplicateCustomer
+        instance. Used by customer_writer to commit a whole queue batch at
+        once.
+        """
+        conn = self._connect()
+        with conn:
+            return self._insert(conn, rows)
+
+    def _insert(self, conn, rows):
+        # A failed INSERT only undoes that statement, the transaction goes on
+        created = datetime.now().isoformat(sep=" ", timespec="seconds")
+        results, indexed = [], []
+        for name, father_name, education in rows:
+            name_key, dedup_key = self._keys(name, father_name)
+            try:
+                cur = conn.execute(INSERT_SQL, (name, father_name, education, created, name_key, dedup_key))
+            except sqlite3.IntegrityError:
+                results.append(DuplicateCustomer(f"{name} is already registered"))
+                continue
+            results.append(cur.lastrowid)
+            indexed.append((cur.lastrowid, name_key))
+        if self.fuzzy and indexed:
+            self._index_trigrams(conn, indexed)
+        return results
+
+    # === READ ===
+    def exists(self, name, father_name=""):
+        _, dedup_key = self._keys(name, father_name)
+        return self._connect().execute(
+            "SELECT 1 FROM customers WHERE dedup_key = ? LIMIT 1", (dedup_key,)).fetchone() is not None
+
+    def existing_keys(self, keys):
+        """The subset of dedup keys already taken (for bulk imports)."""
+        keys = list(keys)
+        found = set()
+        conn = self._connect()
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(k for (k,) in conn.execute(
+                f"SELECT dedup_key FROM customers WHERE dedup_key IN ({marks})", chunk))
+        return found
+
+    def similar(self, name, limit=5, threshold=FUZZY_THRESHOLD):
+        """Near-duplicate names as [(name, similarity)], best first.
+
+        Candidates come from the rarest of the query's trigrams only, read
+        straight from the index up to MAX_POSTINGS entries in total, and
+        just the MAX_CANDIDATES names sharing most of them are scored.
+        Trigrams common to a large part of the table are never probed, so
+        the cost stays flat as the table grows; the price is that a match
+        sharing only very common trigrams with the query can be missed.
+        """
+        if not self.fuzzy:
+            raise RuntimeError("CustomerStore was opened without fuzzy=True")
+        key = normalize(name)
+        grams = trigrams(key)
+        if not key:
+            return []
+        conn = self._connect()
+        marks = ",".join("?" * len(grams))
+        counts = dict(conn.execute(f"SELECT trigram, n FROM trigram_counts WHERE trigram IN ({marks})", list(grams)))
+        # A match needs >= ceil(threshold * |grams|) shared trigrams, so it
+        # must contain at least one of the |grams| - that + 1 rarest
+        probe = len(grams) - math.ceil(threshold * len(grams)) + 1
+        rarest = sorted((g for g in grams if counts.get(g)), key=counts.get)[:probe]
+        probes, postings = [], 0
+        for gram in rarest:
+            if probes and postings + counts[gram] > MAX_POSTINGS:
+                break
+            probes.append(gram)
+            postings += counts[gram]
+        if not probes:
+            return []
+        marks = ",".join("?" * len(probes))
+        ids = [row_id for (row_id,) in conn.execute(
+            f"SELECT customer_id FROM customer_trigrams WHERE trigram IN ({marks}) "
+            f"GROUP BY customer_id ORDER BY COUNT(*) DESC LIMIT ?", probes + [MAX_CANDIDATES])]
+        marks = ",".join("?" * len(ids))
+        candidates = conn.execute(f"SELECT name, name_key FROM customers WHERE id IN ({marks})", ids).fetchall()
+        scored = []
+        for candidate, candidate_key in candidates:
+            other = trigrams(candidate_key)
+            score = len(grams & other) / len(grams | other)
+            if score >= threshold:
+                scored.append((candidate, round(score, 3)))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def _search_clause(self, search):
+        # Prefix match on the normalized name: a range scan on
+        # idx_customers_name_key instead of a LIKE over every row
+        prefix = normalize(search)
+        if not prefix:
+            return "", []
+        return " WHERE name_key >= ? AND name_key < ?", [prefix, prefix + "\U0010ffff"]
+
+    def page(self, search="", order="name", cursor=None, limit=PAGE_SIZE):
+        """One page of customers whose name starts with `search`.
+
+        Returns (frame, next_cursor); pass next_cursor back for the
+        following page (None on the last one). Keyset pagination, so deep
+        pages cost the same as the first.
+        """
+        if order not in ORDERS:
+            raise ValueError(f"order must be one of {list(ORDERS)}")
+        order_by, keyset, op = ORDERS[order]
+        where, params = self._search_clause(search)
+        if cursor:
+            where += (" AND " if where else " WHERE ") + f"{keyset} {op} ({','.join('?' * len(cursor))})"
+            params.extend(cursor)
+        rows = self._connect().execute(
+            f"SELECT id, name_key, name, father_name, education FROM customers{where} "
+            f"ORDER BY {order_by} LIMIT ?", params + [limit + 1]).fetchall()
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = (last[1], last[0]) if order == "name" else (last[0],)
+        frame = pd.DataFrame([r[2:] for r in rows[:limit]], columns=COLUMNS)
+        return frame, next_cursor
+
+    def count(self, search=""):
+        where, params = self._search_clause(search)
+        return self._connect().execute(f"SELECT COUNT(*) FROM customers{where}", params).fetchone()[0]
+
+    def version(self):
+        """Changes whenever a customer is added; cheap enough to call every rerun."""
+        return self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM customers").fetchone()[0]
+
+    def to_frame(self):
+        return pd.read_sql_query(SELECT_FRAME + " ORDER BY id", self._connect())
+
+    def iter_frames(self, chunk_rows=EXPORT_CHUNK_ROWS, upto=None):
+        """All customers (id <= upto) as DataFrames of at most chunk_rows, oldest first."""
+        conn = self._connect()
+        upto = self.version() if upto is None else upto
+        last = 0
+        while True:
+            rows = conn.execute(
+                "SELECT id, name, father_name, education FROM customers WHERE id > ? AND id <= ? "
+                "ORDER BY id LIMIT ?", (last, upto, chunk_rows)).fetchall()
+            if not rows:
+                return
+            last = rows[-1][0]
+            yield pd.DataFrame([r[1:] for r in rows], columns=COLUMNS)
+
+    # === EXCEL ===
+    def export_excel(self, target):
+        """Write all customers to an .xlsx path or file object, on demand only."""
+        self.to_frame().to_excel(target, index=False)
+
+    def import_excel(self, path):
+        """One-time migration from the old customers.xlsx; duplicate rows are skipped."""
+        df = pd.read_excel(path).reindex(columns=COLUMNS).fillna("").astype(str)
+        added = 0
+        for row in df.itertuples(index=False, name=None):
+            try:
+                self.add(*row)
+                added += 1
+            except DuplicateCustomer:
+                pass
+        return added
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def open_store(path=DB_FILE, legacy_excel="customers.xlsx", **options):
+    """Open the store, importing the old Excel file the first time."""
+    store = CustomerStore(path, **options)
+    if store.count() == 0 and legacy_excel and os.path.exists(legacy_excel):
+        store.import_excel(legacy_excel)
+    return store
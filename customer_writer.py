@@ -0,0 +1,130 @@
+# customer_writer.py
+# Single writer for customer_store, shared by every Streamlit session
+# Sessions never write to the database themselves: they put the new row
+# on a queue and wait for its result. One background thread drains the
+# queue and commits everything that arrived within flush_interval in a
+# single transaction (group commit), so a burst of submissions costs one
+# fsync instead of one each and writers never fight over the SQLite lock.
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from customer_store import DuplicateCustomer
+
+# === DEFAULTS ===
+QUEUE_SIZE = 10000
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 0.02  # seconds the first row of a batch may wait for company
+SUBMIT_TIMEOUT = 10
+
+_STOP = object()
+
+
+class WriterClosed(RuntimeError):
+    """Raised when submitting to a writer that has been closed."""
+
+
+class CustomerWriter:
+    def __init__(self, store, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.store = store
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+        self.written = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.batches = 0
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="customer-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # === PRODUCER SIDE (sessions) ===
+    def submit(self, name, father_name, education):
+        """Queue one customer; the Future resolves to its id or raises DuplicateCustomer."""
+        if self._closed:
+            raise WriterClosed("customer writer is closed")
+        future = Future()
+        self._queue.put(((name, father_name, education), future), timeout=SUBMIT_TIMEOUT)
+        return future
+
+    def add(self, name, father_name, education, timeout=SUBMIT_TIMEOUT):
+        """Blocking submit: returns the new id once its batch is committed.
+
+        Besides DuplicateCustomer this can raise WriterClosed, queue.Full
+        (queue still full after SUBMIT_TIMEOUT), concurrent.futures.TimeoutError
+        (queued but not committed in time) or the database error that
+        failed the batch.
+        """
+        return self.submit(name, father_name, education).result(timeout)
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "batches": self.batches,
+        }
+
+    def close(self, timeout=5):
+        if self._closed:
+            return
+        self._closed = True
+        if not self._thread.is_alive():
+            return
+        # Same as calc_log: never hang the process at exit on a full queue
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            print("customer_writer: writer not draining, queued customers are lost")
+            return
+        self._thread.join(timeout)
+
+    # === WRITER THREAD ===
+    def _run(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get()
+                deadline = time.monotonic() + self.flush_interval
+                while True:
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        item = self._queue.get_nowait()
+                    else:
+                        item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                pass
+            if batch:
+                self._write_batch(batch)
+        self.store.close()
+
+    def _write_batch(self, batch):
+        rows = [row for row, _ in batch]
+        try:
+            results = self.store.add_each(rows)
+        except Exception as e:
+            # Nothing was committed; every waiting session gets the error
+            self.failed += len(batch)
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, DuplicateCustomer):
+                self.duplicates += 1
+                future.set_exception(result)
+            else:
+                self.written += 1
+                future.set_result(result)
@@ -0,0 +1,85 @@
+# expense_charts.py
+# Chart rendering for python_Day2_challage.py
+# Charts are returned as PNG/SVG bytes so the page can cache them and
+# rerun without touching matplotlib at all. matplotlib and seaborn are
+# only imported the first time a chart is actually drawn.
+import io
+
+TOP_N = 20          # bars shown before the rest are folded into "Others"
+LABEL_LIMIT = 30    # above this many bars, skip per-bar value labels
+
+
+def top_n(labels, values, n=TOP_N, signed=False):
+    """Keep the n largest bars and fold the rest into "Others".
+
+    With signed=True (net balances) positive and negative leftovers are
+    folded separately, otherwise they would cancel out to ~0.
+    """
+    if len(labels) <= n:
+        return list(labels), list(values)
+    order = sorted(range(len(values)), key=lambda i: abs(values[i]), reverse=True)
+    keep, rest = order[:n], order[n:]
+    out_labels = [labels[i] for i in keep]
+    out_values = [values[i] for i in keep]
+    if signed:
+        owed = [values[i] for i in rest if values[i] > 0]
+        owes = [values[i] for i in rest if values[i] < 0]
+        if owed:
+            out_labels.append(f"Others owed ({len(owed)})")
+            out_values.append(sum(owed))
+        if owes:
+            out_labels.append(f"Others owing ({len(owes)})")
+            out_values.append(sum(owes))
+    else:
+        out_labels.append(f"Others ({len(rest)})")
+        out_values.append(sum(values[i] for i in rest))
+    return out_labels, out_values
+
+
+def _new_figure(figsize):
+    # Figure() instead of pyplot: no global figure registry to clean up
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    return fig, fig.add_subplot()
+
+
+def _to_bytes(fig, fmt, dpi):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=fmt, dpi=dpi, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def render_balance_chart(labels, values, fmt="png", dpi=100):
+    fig, ax = _new_figure((10, 6))
+    colors = ['#000000' if x >= 0 else '#888888' for x in values]
+    bars = ax.bar(labels, values, color=colors, edgecolor='black', linewidth=1.5)
+    ax.set_ylabel("Net Balance (₹)", fontsize=12, fontweight='bold')
+    ax.set_title("Who Owes / Is Owed", fontsize=16, fontweight='bold', pad=20)
+    ax.axhline(0, color='black', linewidth=1)
+    ax.grid(True, axis='y', linestyle='--', alpha=0.3)
+
+    if len(labels) <= LABEL_LIMIT:
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height + (0.01 if height >= 0 else -0.01),
+                    f'₹{abs(height):.2f}', ha='center', va='bottom' if height >= 0 else 'top',
+                    fontweight='bold', fontsize=10)
+    else:
+        ax.tick_params(axis='x', labelrotation=90, labelsize=7)
+    return _to_bytes(fig, fmt, dpi)
+
+
+def render_spent_chart(labels, values, fmt="png", dpi=100):
+    fig, ax = _new_figure((10, 5))
+    if len(labels) <= LABEL_LIMIT:
+        import seaborn as sns
+        sns.barplot(x=labels, y=values, hue=labels, palette='Greys', legend=False, ax=ax)
+        for i, v in enumerate(values):
+            ax.text(i, v + 0.01, f"₹{v:,.2f}", ha='center', fontweight='bold')
+    else:
+        # Large groups: one plain bar call, no per-bar artists
+        ax.bar(labels, values, color='#555555')
+        ax.tick_params(axis='x', labelrotation=90, labelsize=7)
+    ax.set_ylabel("Amount (₹)")
+    ax.set_title("Total Amount Paid")
+    return _to_bytes(fig, fmt, dpi)
@@ -0,0 +1,266 @@
+# expense_db.py
+# Persistent SQLite backend for python_Day2_challage.py
+# Holds any number of groups. Every person row carries running paid/owed
+# totals (paise) that are updated in the same transaction as each
+# expense, so opening a group reads one row per person instead of every
+# expense. Raw expenses are read a page at a time, newest first.
+# Bulk loads skip the per-expense total updates and rebuild all of a
+# group's totals at the end with one NumPy pass (recompute_totals), and
+# a full export loads the group into an expense_store.ExpenseStore.
+import sqlite3
+import threading
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from expense_ledger import split_shares
+from expense_store import ExpenseStore
+
+DB_FILE = "expenses.db"
+PAGE_SIZE = 50
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS people (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL REFERENCES groups (id),
+    name TEXT NOT NULL,
+    active INTEGER NOT NULL DEFAULT 1,
+    paid INTEGER NOT NULL DEFAULT 0,
+    owed INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (group_id, name)
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    id INTEGER PRIMARY KEY,
+    group_id INTEGER NOT NULL REFERENCES groups (id),
+    payer_id INTEGER NOT NULL REFERENCES people (id),
+    amount INTEGER NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_group_date ON expenses (group_id, date);
+CREATE INDEX IF NOT EXISTS idx_expenses_group_payer ON expenses (group_id, payer_id);
+CREATE TABLE IF NOT EXISTS expense_splits (
+    expense_id INTEGER NOT NULL REFERENCES expenses (id),
+    person_id INTEGER NOT NULL REFERENCES people (id),
+    share INTEGER NOT NULL,
+    PRIMARY KEY (expense_id, person_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_splits_person ON expense_splits (person_id);
+"""
+
+
+class ExpenseDB:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    # === GROUPS ===
+    def groups(self):
+        return [name for (name,) in self._connect().execute("SELECT name FROM groups ORDER BY name")]
+
+    def group_id(self, name, create=True):
+        conn = self._connect()
+        row = conn.execute("SELECT id FROM groups WHERE name = ?", (name,)).fetchone()
+        if row:
+            return row[0]
+        if not create:
+            raise KeyError(f"No such group: {name}")
+        with conn:
+            cur = conn.execute("INSERT INTO groups (name, created) VALUES (?, ?)",
+                               (name, datetime.now().isoformat(sep=" ", timespec="seconds")))
+        return cur.lastrowid
+
+    # === PEOPLE ===
+    def _person_ids(self, conn, group_id, names):
+        """name -> id, creating people who are new to the group."""
+        names = list(dict.fromkeys(names))
+        ids = {}
+        for start in range(0, len(names), 500):
+            chunk = names[start:start + 500]
+            marks = ",".join("?" * len(chunk))
+            ids.update(conn.execute(
+                f"SELECT name, id FROM people WHERE group_id = ? AND name IN ({marks})", [group_id, *chunk]))
+        missing = [n for n in names if n not in ids]
+        if missing:
+            conn.executemany("INSERT INTO people (group_id, name) VALUES (?, ?)", [(group_id, n) for n in missing])
+            ids.update(self._person_ids(conn, group_id, missing))
+        return ids
+
+    def add_person(self, group_id, name):
+        conn = self._connect()
+        with conn:
+            self._person_ids(conn, group_id, [name])
+            conn.execute("UPDATE people SET active = 1 WHERE group_id = ? AND name = ?", (group_id, name))
+
+    def remove_person(self, group_id, name):
+        # People with expenses keep their row (and balance); they are just
+        # no longer offered as payer / split member
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE people SET active = 0 WHERE group_id = ? AND name = ?", (group_id, name))
+
+    def people(self, group_id):
+        return [name for (name,) in self._connect().execute(
+            "SELECT name FROM people WHERE group_id = ? AND active = 1 ORDER BY id", (group_id,))]
+
+    def totals(self, group_id):
+        """{name: (paid, owed)} in paise for everyone with a row in the group."""
+        rows = self._connect().execute(
+            "SELECT name, paid, owed FROM people WHERE group_id = ? AND (active = 1 OR paid != 0 OR owed != 0) "
+            "ORDER BY id", (group_id,))
+        return {name: (paid, owed) for name, paid, owed in rows}
+
+    # === EXPENSES ===
+    def add_expense(self, group_id, paid_by, amount, description, date, split_among):
+        return self.add_expenses(group_id, [(paid_by, amount, description, date, split_among)])[0]
+
+    def add_expenses(self, group_id, expenses, update_totals=True):
+        """Insert (paid_by, paise, description, date, split_among) rows in one transaction.
+
+        Returns the new expense ids. With update_totals=False the people
+        totals are left alone; call recompute_totals once the load is done.
+        """
+        conn = self._connect()
+        with conn:
+            names = [e[0] for e in expenses] + [p for e in expenses for p in e[4]]
+            ids = self._person_ids(conn, group_id, names)
+            paid, owed = defaultdict(int), defaultdict(int)
+            expense_ids, splits = [], []
+            for paid_by, amount, description, date, split_among in expenses:
+                members = list(dict.fromkeys(split_among))
+                if amount <= 0 or not members:
+                    raise ValueError("Expense needs a positive amount and at least one person to split among")
+                cur = conn.execute(
+                    "INSERT INTO expenses (group_id, payer_id, amount, description, date) VALUES (?, ?, ?, ?, ?)",
+                    (group_id, ids[paid_by], amount, description or "", _date_text(date)))
+                expense_ids.append(cur.lastrowid)
+                paid[ids[paid_by]] += amount
+                for member, share in zip(members, split_shares(amount, members)):
+                    splits.append((cur.lastrowid, ids[member], share))
+                    owed[ids[member]] += share
+            conn.executemany("INSERT INTO expense_splits (expense_id, person_id, share) VALUES (?, ?, ?)", splits)
+            if update_totals:
+                self._apply_totals(conn, paid, owed, 1)
+        return expense_ids
+
+    def remove_expense(self, expense_id):
+        conn = self._connect()
+        with conn:
+            payer_id, amount = conn.execute(
+                "SELECT payer_id, amount FROM expenses WHERE id = ?", (expense_id,)).fetchone()
+            owed = dict(conn.execute(
+                "SELECT person_id, share FROM expense_splits WHERE expense_id = ?", (expense_id,)))
+            conn.execute("DELETE FROM expense_splits WHERE expense_id = ?", (expense_id,))
+            conn.execute("DELETE FROM expenses WHERE id = ?", (expense_id,))
+            self._apply_totals(conn, {payer_id: amount}, owed, -1)
+
+    def _apply_totals(self, conn, paid, owed, sign):
+        conn.executemany("UPDATE people SET paid = paid + ? WHERE id = ?",
+                         [(sign * amount, pid) for pid, amount in paid.items()])
+        conn.executemany("UPDATE people SET owed = owed + ? WHERE id = ?",
+                         [(sign * amount, pid) for pid, amount in owed.items()])
+
+    def recompute_totals(self, group_id):
+        """Rebuild paid/owed for everyone in the group from the expense rows.
+
+        Two np.bincount calls over the group's amounts and split shares,
+        then one UPDATE per person, instead of one per expense.
+        """
+        conn = self._connect()
+        with conn:
+            # Write lock up front, so no expense lands between the reads and the update
+            conn.execute("BEGIN IMMEDIATE")
+            ids = np.array([pid for (pid,) in conn.execute(
+                "SELECT id FROM people WHERE group_id = ? ORDER BY id", (group_id,))], dtype=np.int64)
+            payments = np.array(conn.execute(
+                "SELECT payer_id, amount FROM expenses WHERE group_id = ?", (group_id,)).fetchall(),
+                dtype=np.int64).reshape(-1, 2)
+            shares = np.array(conn.execute(
+                "SELECT s.person_id, s.share FROM expense_splits s JOIN people p ON p.id = s.person_id "
+                "WHERE p.group_id = ?", (group_id,)).fetchall(), dtype=np.int64).reshape(-1, 2)
+            paid = np.bincount(np.searchsorted(ids, payments[:, 0]), weights=payments[:, 1], minlength=len(ids))
+            owed = np.bincount(np.searchsorted(ids, shares[:, 0]), weights=shares[:, 1], minlength=len(ids))
+            conn.executemany("UPDATE people SET paid = ?, owed = ? WHERE id = ?",
+                             zip(paid.astype(np.int64).tolist(), owed.astype(np.int64).tolist(), ids.tolist()))
+
+    def expense_count(self, group_id):
+        return self._connect().execute("SELECT COUNT(*) FROM expenses WHERE group_id = ?", (group_id,)).fetchone()[0]
+
+    def expense_page(self, group_id, cursor=None, limit=PAGE_SIZE):
+        """Newest-first page of expenses; pass the returned cursor to get the next one.
+
+        Returns (rows, next_cursor) where rows are dicts with the page's
+        "Split Among" filled in and next_cursor is None on the last page.
+        """
+        conn = self._connect()
+        sql = ("SELECT e.id, p.name, e.amount, e.description, e.date FROM expenses e "
+               "JOIN people p ON p.id = e.payer_id WHERE e.group_id = ?")
+        params = [group_id]
+        if cursor:
+            sql += " AND (e.date, e.id) < (?, ?)"
+            params.extend(cursor)
+        sql += " ORDER BY e.date DESC, e.id DESC LIMIT ?"
+        params.append(limit + 1)
+        rows = conn.execute(sql, params).fetchall()
+        next_cursor = (rows[limit - 1][4], rows[limit - 1][0]) if len(rows) > limit else None
+        rows = rows[:limit]
+
+        members = defaultdict(list)
+        if rows:
+            marks = ",".join("?" * len(rows))
+            for expense_id, name in conn.execute(
+                    f"SELECT s.expense_id, p.name FROM expense_splits s JOIN people p ON p.id = s.person_id "
+                    f"WHERE s.expense_id IN ({marks})", [r[0] for r in rows]):
+                members[expense_id].append(name)
+        page = [
+            {"ID": expense_id, "Paid By": payer, "Amount": amount / 100, "Description": description,
+             "Date": date, "Split Among": ", ".join(members[expense_id])}
+            for expense_id, payer, amount, description, date in rows
+        ]
+        return page, next_cursor
+
+    def expense_store(self, group_id):
+        """Every expense in the group, oldest first, as an ExpenseStore (e.g. for a full export)."""
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT e.id, p.name, e.amount, e.description, e.date FROM expenses e "
+            "JOIN people p ON p.id = e.payer_id WHERE e.group_id = ? ORDER BY e.date, e.id", (group_id,)).fetchall()
+        members = defaultdict(list)
+        for expense_id, name in conn.execute(
+                "SELECT s.expense_id, p.name FROM expense_splits s JOIN people p ON p.id = s.person_id "
+                "WHERE p.group_id = ?", (group_id,)):
+            members[expense_id].append(name)
+        store = ExpenseStore()
+        if rows:
+            expense_ids, payers, amounts, descriptions, dates = zip(*rows)
+            store.extend(payers, amounts, descriptions, dates, [members[i] for i in expense_ids])
+        return store
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def _date_text(date):
+    if isinstance(date, str):
+        return date
+    return date.strftime("%Y-%m-%d %H:%M:%S")
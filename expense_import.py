@@ -0,0 +1,108 @@
+# expense_import.py
+# Bulk import of expenses from CSV / Excel exports into expense_db
+# Files are read a chunk at a time (file_import), each chunk is cleaned
+# with vectorized pandas string/number ops and written in one
+# transaction, which also updates the group's running balances. Memory
+# stays at one chunk whatever the file size.
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import file_import
+from file_import import CHUNK_ROWS, ImportResult, iter_chunks, text_column
+
+MAX_PAISE = 10 ** 12  # ₹1,000 crore; anything bigger is a bad cell, and sums stay far inside int64
+FIELDS = ["Paid By", "Amount", "Description", "Date", "Split Among"]
+
+# Column names commonly seen in bank/card exports, lower-cased
+SYNONYMS = {
+    "Paid By": ["paid by", "paid_by", "payer", "paidby", "card holder", "cardholder"],
+    "Amount": ["amount", "amount (inr)", "amount (₹)", "debit", "debit amount", "withdrawal amount", "value"],
+    "Description": ["description", "narration", "details", "particulars", "remarks", "merchant"],
+    "Date": ["date", "transaction date", "txn date", "value date", "posting date"],
+    "Split Among": ["split among", "split_among", "split", "shared with", "participants"],
+}
+
+
+def guess_mapping(columns):
+    """{field: column or None} from header names."""
+    return file_import.guess_mapping(columns, FIELDS, SYNONYMS)
+
+
+# === CLEANING ===
+def normalize_chunk(chunk, mapping, default_payer=None, default_split=None, dayfirst=True, now=None):
+    """Clean one chunk.
+
+    Returns (expenses, rejected) where expenses are
+    (paid_by, paise, description, date, split_among) tuples ready for
+    ExpenseDB.add_expenses and rejected is a Series of reasons indexed by
+    the chunk's row index.
+    """
+    now = now or datetime.now()
+    payer = text_column(chunk, mapping.get("Paid By"))
+    if default_payer:
+        payer = payer.mask(payer == "", default_payer)
+
+    raw_amount = text_column(chunk, mapping.get("Amount")).str.replace(r"(?i)₹|rs\.?|inr|,|\s", "", regex=True)
+    amount = pd.to_numeric(raw_amount, errors="coerce")
+    paise = (amount * 100).round()
+
+    description = text_column(chunk, mapping.get("Description"))
+
+    date_text = text_column(chunk, mapping.get("Date"))
+    # ISO text (and every Excel date cell, which text_column turns into ISO) is
+    # year-month-day; dayfirst only applies to ambiguous d/m/y text
+    iso = date_text.str.match(r"\d{4}-\d{2}-\d{2}")
+    dates = pd.to_datetime(date_text.where(iso), errors="coerce", format="ISO8601")
+    other = ~iso & (date_text != "")
+    if other.any():
+        dates[other] = pd.to_datetime(date_text[other], errors="coerce", dayfirst=dayfirst, format="mixed")
+    bad_date = dates.isna() & (date_text != "")
+    dates = dates.fillna(pd.Timestamp(now))
+
+    split_text = text_column(chunk, mapping.get("Split Among"))
+    split = split_text.str.split(r"\s*[,;]\s*", regex=True)
+
+    reasons = pd.Series(pd.NA, index=chunk.index, dtype="string")
+    reasons = reasons.mask(bad_date, "unreadable date")
+    reasons = reasons.mask(~np.isfinite(paise) | (paise > MAX_PAISE), "amount too large")
+    reasons = reasons.mask(paise <= 0, "amount must be positive")
+    reasons = reasons.mask(amount.isna(), "missing or invalid amount")
+    reasons = reasons.mask(payer == "", "missing payer")
+    ok = reasons.isna()
+
+    default_split = list(default_split or [])
+    expenses = []
+    for p, a, d, t, members, has_split in zip(
+            payer[ok], paise[ok].astype("int64"), description[ok], dates[ok], split[ok], split_text[ok] != ""):
+        members = [m for m in members if m] if has_split else (default_split or [p])
+        expenses.append((p, int(a), d, t.to_pydatetime(), members))
+    return expenses, reasons[~ok]
+
+
+# === IMPORT ===
+def import_expenses(db, group_id, file, filename, mapping, default_payer=None, default_split=None,
+                    dayfirst=True, chunk_rows=CHUNK_ROWS, progress=None):
+    """Stream a CSV/XLSX file into the group; `progress(fraction, result)` is called per chunk.
+
+    Balances are rebuilt once at the end (also if the import stops
+    part-way) rather than updated per expense.
+    """
+    if mapping.get("Amount") is None or (mapping.get("Paid By") is None and not default_payer):
+        raise ValueError("Map an Amount column and either a Paid By column or a default payer")
+    result = ImportResult()
+    now = datetime.now()
+    try:
+        for chunk, fraction in iter_chunks(file, filename, chunk_rows):
+            expenses, rejected = normalize_chunk(chunk, mapping, default_payer, default_split, dayfirst, now)
+            if expenses:
+                db.add_expenses(group_id, expenses, update_totals=False)
+            result.imported += len(expenses)
+            result.reject(rejected.index.tolist(), rejected.tolist())
+            if progress:
+                progress(fraction, result)
+    finally:
+        if result.imported:
+            db.recompute_totals(group_id)
+    return result
@@ -0,0 +1,141 @@
+# expense_ledger.py
+# Running balances for python_Day2_challage.py
+# Keeps per-person paid/owed totals (integer paise) up to date as
+# expenses come and go, so a page rerun only costs O(people):
+#   add_expense / remove_expense - O(k), k = people the expense is split among
+#   recompute / from_store       - full rebuild with NumPy, for bulk loads
+import itertools
+
+import numpy as np
+
+
+def split_shares(amount, members):
+    """Split paise evenly; the first `amount % k` members pay one paisa more."""
+    base, extra = divmod(amount, len(members))
+    return [base + (i < extra) for i in range(len(members))]
+
+
+class ExpenseLedger:
+    def __init__(self):
+        self.paid = {}
+        self.owed = {}
+        self.expenses = {}  # id -> (payer, amount, members)
+        self._ids = itertools.count(1)
+
+    # === PEOPLE ===
+    def add_person(self, person):
+        self.paid.setdefault(person, 0)
+        self.owed.setdefault(person, 0)
+
+    def people(self):
+        return list(self.paid)
+
+    # === EXPENSES ===
+    def add_expense(self, payer, amount, split_among, expense_id=None):
+        if amount <= 0:
+            raise ValueError("Amount must be positive")
+        members = tuple(dict.fromkeys(split_among))  # de-duplicate, keep order
+        if not members:
+            raise ValueError("Expense must be split among at least one person")
+        if expense_id is None:
+            expense_id = next(self._ids)
+        elif expense_id in self.expenses:
+            raise ValueError(f"Duplicate expense id: {expense_id}")
+
+        self._apply(payer, amount, members, 1)
+        self.expenses[expense_id] = (payer, amount, members)
+        return expense_id
+
+    def remove_expense(self, expense_id):
+        payer, amount, members = self.expenses.pop(expense_id)
+        self._apply(payer, amount, members, -1)
+
+    def _apply(self, payer, amount, members, sign):
+        self.add_person(payer)
+        self.paid[payer] += sign * amount
+        for member, share in zip(members, split_shares(amount, members)):
+            self.add_person(member)
+            self.owed[member] += sign * share
+
+    # === TOTALS ===
+    def balances(self):
+        """Net paise per person: positive is owed money, negative owes."""
+        return {p: self.paid[p] - self.owed[p] for p in self.paid}
+
+    def total(self):
+        return sum(self.paid.values())
+
+    def __len__(self):
+        return len(self.expenses)
+
+    # === BULK ===
+    def recompute(self):
+        """Rebuild paid/owed from scratch with NumPy (e.g. after a bulk load)."""
+        people = self.people()
+        for payer, _, members in self.expenses.values():
+            people.append(payer)
+            people.extend(members)
+        people = list(dict.fromkeys(people))
+        index = {p: i for i, p in enumerate(people)}
+        rows = list(self.expenses.values())
+
+        payers = np.fromiter((index[r[0]] for r in rows), dtype=np.int64, count=len(rows))
+        amounts = np.fromiter((r[1] for r in rows), dtype=np.int64, count=len(rows))
+        sizes = np.fromiter((len(r[2]) for r in rows), dtype=np.int64, count=len(rows))
+        members = np.fromiter((index[m] for r in rows for m in r[2]), dtype=np.int64, count=int(sizes.sum()))
+
+        paid, owed = recompute_totals(len(people), payers, amounts, sizes, members)
+        self.paid = dict(zip(people, paid.tolist()))
+        self.owed = dict(zip(people, owed.tolist()))
+
+    @classmethod
+    def from_totals(cls, totals):
+        """Ledger seeded with {person: (paid, owed)}, e.g. from expense_db.
+
+        It has the balances but not the individual expenses.
+        """
+        ledger = cls()
+        for person, (paid, owed) in totals.items():
+            ledger.paid[person] = paid
+            ledger.owed[person] = owed
+        return ledger
+
+    @classmethod
+    def from_store(cls, store):
+        """Ledger for every row of an expense_store.ExpenseStore.
+
+        Expense ids are the store's row numbers. Totals are computed with
+        NumPy straight from the store's code columns.
+        """
+        ledger = cls()
+        paid, owed = recompute_totals(
+            len(store.people), store.payer.view(), store.amount.view(),
+            store.split_sizes(), store.split_members.view(),
+        )
+        ledger.paid = dict(zip(store.people, paid.tolist()))
+        ledger.owed = dict(zip(store.people, owed.tolist()))
+        offsets = store.split_offsets.view().tolist()
+        members = [store.people[c] for c in store.split_members.view().tolist()]
+        payers = [store.people[c] for c in store.payer.view().tolist()]
+        for row, (payer, amount) in enumerate(zip(payers, store.amount.view().tolist())):
+            ledger.expenses[row] = (payer, amount, tuple(members[offsets[row]:offsets[row + 1]]))
+        ledger._ids = itertools.count(len(store))
+        return ledger
+
+
+def recompute_totals(n_people, payers, amounts, sizes, members):
+    """Vectorized paid/owed totals.
+
+    payers/amounts/sizes have one entry per expense; members is every
+    expense's split list concatenated, as person indexes.
+    """
+    paid = np.bincount(payers, weights=amounts, minlength=n_people)
+    if not len(members):
+        return paid.astype(np.int64), np.zeros(n_people, dtype=np.int64)
+    base, extra = np.divmod(amounts, sizes)
+    # Position of each member inside its own expense's split list
+    starts = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    position = np.arange(len(members)) - starts
+    shares = np.repeat(base, sizes) + (position < np.repeat(extra, sizes))
+    owed = np.bincount(members, weights=shares, minlength=n_people)
+    return paid.astype(np.int64), owed.astype(np.int64)
@@ -0,0 +1,109 @@
+# expense_settle.py
+# "Who owes whom" for python_Day2_challage.py
+# Balances are integer paise (positive = is owed, negative = owes), so
+# rounding never leaves a stray 0.01 unsettled.
+#   settle()       - greedy with two heaps, O(n log n), at most n-1 transfers
+#   settle_exact() - fewest possible transfers, exponential, small groups only
+#   settle_auto()  - exact for small groups, greedy otherwise
+import heapq
+
+EXACT_LIMIT = 16  # settle_exact is O(2^n * n)
+AUTO_EXACT_LIMIT = 12  # keeps settle_auto well under 100 ms
+
+
+def to_paise(amount):
+    return int(round(amount * 100))
+
+
+def balances_to_paise(balances):
+    """Round rupee balances to paise so they still add up to exactly zero."""
+    paise = {person: to_paise(amount) for person, amount in balances.items()}
+    residue = sum(paise.values())
+    if residue and paise:
+        # Rounding drift is a few paise at most; give it to the biggest balance
+        target = max(paise, key=lambda p: abs(paise[p]))
+        paise[target] -= residue
+    return paise
+
+
+def settle(balances):
+    """Return [(from, to, paise), ...] that settles every balance.
+
+    Always pays the largest debtor against the largest creditor, so each
+    step settles at least one person completely.
+    """
+    creditors = [(-amount, person) for person, amount in balances.items() if amount > 0]
+    debtors = [(amount, person) for person, amount in balances.items() if amount < 0]
+    if sum(-c for c, _ in creditors) != -sum(d for d, _ in debtors):
+        raise ValueError("Balances must add up to zero")
+    heapq.heapify(creditors)
+    heapq.heapify(debtors)
+
+    transfers = []
+    while creditors and debtors:
+        owed, creditor = heapq.heappop(creditors)
+        owes, debtor = heapq.heappop(debtors)
+        amount = min(-owed, -owes)
+        transfers.append((debtor, creditor, amount))
+        if -owed > amount:
+            heapq.heappush(creditors, (owed + amount, creditor))
+        if -owes > amount:
+            heapq.heappush(debtors, (owes + amount, debtor))
+    return transfers
+
+
+def settle_exact(balances):
+    """Fewest possible transfers.
+
+    The minimum is (people with a balance) - (most disjoint zero-sum groups
+    they can be split into); each group then settles internally with
+    group size - 1 transfers.
+    """
+    people = [p for p, amount in balances.items() if amount]
+    n = len(people)
+    if n > EXACT_LIMIT:
+        raise ValueError(f"settle_exact supports at most {EXACT_LIMIT} people with a balance, got {n}")
+    amounts = [balances[p] for p in people]
+    if sum(amounts) != 0:
+        raise ValueError("Balances must add up to zero")
+
+    size = 1 << n
+    subset_sum = [0] * size
+    groups = [0] * size  # most zero-sum groups a subset can be split into
+    for mask in range(1, size):
+        low = mask & -mask
+        subset_sum[mask] = subset_sum[mask ^ low] + amounts[low.bit_length() - 1]
+        best = 0
+        rest = mask
+        while rest:
+            bit = rest & -rest
+            best = max(best, groups[mask ^ bit])
+            rest ^= bit
+        groups[mask] = best + (subset_sum[mask] == 0)
+
+    # Walk back from the full set to recover one optimal partition
+    order = []
+    mask = size - 1
+    while mask:
+        bit = next(
+            b for b in (1 << i for i in range(n))
+            if mask & b and groups[mask ^ b] + (subset_sum[mask] == 0) == groups[mask]
+        )
+        order.append(bit.bit_length() - 1)
+        mask ^= bit
+
+    transfers = []
+    group, prefix = {}, 0
+    for i in reversed(order):
+        group[people[i]] = amounts[i]
+        prefix += amounts[i]
+        if prefix == 0:
+            transfers.extend(settle(group))
+            group = {}
+    return transfers
+
+
+def settle_auto(balances, exact_limit=AUTO_EXACT_LIMIT):
+    if sum(1 for amount in balances.values() if amount) <= exact_limit:
+        return settle_exact(balances)
+    return settle(balances)
@@ -0,0 +1,127 @@
+# expense_store.py
+# Columnar, append-only expense storage for python_Day2_challage.py
+# Replaces the list of dicts + pd.concat pair: one set of NumPy columns
+# that double in capacity when full (amortized O(1) append), with people
+# stored as integer codes. "Split Among" lists are kept CSR-style: one
+# flat array of member codes plus an offsets array.
+import numpy as np
+import pandas as pd
+
+INITIAL_CAPACITY = 64
+
+
+class GrowableArray:
+    def __init__(self, dtype, capacity=INITIAL_CAPACITY):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.size = 0
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed > len(self.data):
+            capacity = max(needed, 2 * len(self.data))
+            grown = np.empty(capacity, dtype=self.data.dtype)
+            grown[:self.size] = self.data[:self.size]
+            self.data = grown
+
+    def append(self, value):
+        self._reserve(1)
+        self.data[self.size] = value
+        self.size += 1
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self.data.dtype)
+        self._reserve(len(values))
+        self.data[self.size:self.size + len(values)] = values
+        self.size += len(values)
+
+    def view(self):
+        return self.data[:self.size]
+
+    def __len__(self):
+        return self.size
+
+
+class ExpenseStore:
+    def __init__(self):
+        self.people = []  # code -> name
+        self.codes = {}   # name -> code
+        self.payer = GrowableArray(np.int32)
+        self.amount = GrowableArray(np.int64)  # paise
+        self.date = GrowableArray("datetime64[s]")
+        self.description = GrowableArray(object)
+        self.split_offsets = GrowableArray(np.int64)
+        self.split_offsets.append(0)
+        self.split_members = GrowableArray(np.int32)
+
+    def code(self, person):
+        code = self.codes.get(person)
+        if code is None:
+            code = self.codes[person] = len(self.people)
+            self.people.append(person)
+        return code
+
+    # === APPEND ===
+    def append(self, paid_by, amount, description, date, split_among):
+        """Add one expense; `amount` is in paise. Returns its row number."""
+        row = len(self)
+        self.payer.append(self.code(paid_by))
+        self.amount.append(amount)
+        self.description.append(description)
+        self.date.append(np.datetime64(date, "s"))
+        self.split_members.extend([self.code(p) for p in dict.fromkeys(split_among)])
+        self.split_offsets.append(len(self.split_members))
+        return row
+
+    def extend(self, paid_by, amounts, descriptions, dates, split_among):
+        """Bulk append; split_among is one list of names per expense."""
+        self.payer.extend([self.code(p) for p in paid_by])
+        self.amount.extend(amounts)
+        self.description.extend(descriptions)
+        self.date.extend(np.asarray(dates, dtype="datetime64[s]"))
+        split_among = [list(dict.fromkeys(members)) for members in split_among]
+        sizes = [len(members) for members in split_among]
+        self.split_members.extend([self.code(p) for members in split_among for p in members])
+        self.split_offsets.extend(len(self.split_members) - sum(sizes) + np.cumsum(sizes))
+
+    def __len__(self):
+        return len(self.payer)
+
+    # === READ ===
+    def split_sizes(self):
+        return np.diff(self.split_offsets.view())
+
+    def split_among(self, row):
+        offsets = self.split_offsets.data
+        return [self.people[c] for c in self.split_members.data[offsets[row]:offsets[row + 1]]]
+
+    def expense(self, row):
+        return {
+            "Paid By": self.people[self.payer.data[row]],
+            "Amount": self.amount.data[row] / 100,
+            "Description": self.description.data[row],
+            "Date": pd.Timestamp(self.date.data[row]),
+            "Split Among": self.split_among(row),
+        }
+
+    def to_frame(self, start=0, stop=None, split_among=False):
+        """DataFrame over rows [start:stop].
+
+        Built from slices of the stored columns with no per-row Python
+        work; only Amount (paise -> rupees) is computed. "Split Among"
+        strings are built only when asked for, e.g. for CSV export.
+        """
+        rows = slice(start, stop)
+        frame = pd.DataFrame({
+            "Paid By": pd.Categorical.from_codes(self.payer.view()[rows], categories=self.people),
+            "Amount": self.amount.view()[rows] / 100,
+            "Description": self.description.view()[rows],
+            "Date": self.date.view()[rows],
+        }, copy=False)
+        frame.index = pd.RangeIndex(*rows.indices(len(self)))
+        if split_among:
+            frame["Split Among"] = [", ".join(self.split_among(r)) for r in frame.index]
+        return frame
+
+    def nbytes(self):
+        columns = [self.payer, self.amount, self.date, self.description, self.split_offsets, self.split_members]
+        return sum(c.view().nbytes for c in columns)
@@ -0,0 +1,110 @@
+# file_import.py
+# Chunked CSV / Excel reading shared by expense_import and customer_import
+# Files are read a chunk at a time (pandas chunks for CSV, openpyxl
+# read-only rows for Excel), so memory stays at one chunk whatever the
+# file size. Also the header-to-field guessing and the result/rejected
+# rows bookkeeping both importers report back to their page.
+import io
+import os
+
+import pandas as pd
+
+CHUNK_ROWS = 5000
+MAX_REJECTED_SAMPLES = 1000
+
+
+class ImportResult:
+    def __init__(self):
+        self.imported = 0
+        self.rejected = 0
+        self.rejected_rows = []  # (file row number, reason), first MAX_REJECTED_SAMPLES only
+
+    def reject(self, rows, reasons):
+        self.rejected += len(rows)
+        room = MAX_REJECTED_SAMPLES - len(self.rejected_rows)
+        if room > 0:
+            self.rejected_rows.extend(zip(rows[:room], reasons[:room]))
+
+
+def _is_excel(filename):
+    return os.path.splitext(filename)[1].lower() in (".xlsx", ".xlsm")
+
+
+# === READING ===
+def read_columns(file, filename):
+    """Header row of the file, without reading the rest."""
+    for chunk, _ in iter_chunks(file, filename, chunk_rows=1):
+        columns = list(chunk.columns)
+        break
+    else:
+        columns = []
+    file.seek(0)
+    return columns
+
+
+def guess_mapping(columns, fields, synonyms):
+    """{field: column or None} from header names.
+
+    `synonyms` maps each field to other lower-cased header names for it.
+    """
+    lowered = {str(c).strip().lower(): c for c in columns}
+    return {
+        field: next((lowered[name] for name in [field.lower()] + synonyms.get(field, []) if name in lowered), None)
+        for field in fields
+    }
+
+
+def iter_chunks(file, filename, chunk_rows=CHUNK_ROWS):
+    """Yield (DataFrame chunk, fraction of the file read so far).
+
+    Chunks are indexed by 1-based file row (row 1 is the header), so the
+    index of a rejected row is the row number to report.
+    """
+    chunks = _iter_excel(file, chunk_rows) if _is_excel(filename) else _iter_csv(file, chunk_rows)
+    first_row = 2
+    for chunk, fraction in chunks:
+        chunk.index = pd.RangeIndex(first_row, first_row + len(chunk))
+        first_row += len(chunk)
+        yield chunk, fraction
+
+
+def _iter_csv(file, chunk_rows):
+    size = file.seek(0, io.SEEK_END) or 1
+    file.seek(0)
+    with pd.read_csv(file, chunksize=chunk_rows, dtype=str, keep_default_na=False,
+                     skipinitialspace=True, encoding_errors="replace") as reader:
+        for chunk in reader:
+            yield chunk, min(1.0, file.tell() / size)
+
+
+def _iter_excel(file, chunk_rows):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[0]
+        total = sheet.max_row or 0
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(h).strip() if h is not None else f"Column {i + 1}" for i, h in enumerate(header)]
+        batch, done = [], 1
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) >= chunk_rows:
+                done += len(batch)
+                yield pd.DataFrame(batch, columns=columns), min(1.0, done / total) if total else 0.0
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns), 1.0
+    finally:
+        workbook.close()
+
+
+# === CLEANING ===
+def text_column(chunk, column):
+    """Column as trimmed strings, "" for blanks (all "" if column is None)."""
+    if column is None:
+        return pd.Series("", index=chunk.index, dtype="string")
+    return chunk[column].astype("string").fillna("").str.strip()
@@ -1,8 +1,38 @@
 # calculator.py
-from flask import Flask, request, render_template_string
+import csv
+import gzip
+import hashlib
+import io
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+
+from flask import Flask, Response, request, jsonify
+from calc_engine import CalcError, evaluate, evaluate_many, evaluate_columns
+from calc_log import CalculationLog
+from calc_history import CalculationHistory
+from calc_metrics import Metrics
+import calc_engine
 
 app = Flask(__name__)
 
+# Calculations are written as JSON lines by a background thread, which
+# also inserts them into the SQLite history in batches. Records the log
+# drops under load are missing from the history too; they are counted
+# in history_dropped_records_total on /metrics.
+history = CalculationHistory(os.environ.get("CALC_HISTORY_DB", "calculations.db"))
+calc_log = CalculationLog(os.environ.get("CALC_LOG_FILE", "calculations.log"), sinks=[history.add_many],
+                          on_drop=history.count_dropped)
+
+# Per-route counters and latency histograms, served on /metrics
+metrics = Metrics()
+metrics.gauge("log_queue_length", "Calculation log records waiting to be written.", lambda: calc_log.stats()["queued"])
+metrics.gauge("log_dropped_records_total", "Calculation log records dropped.", lambda: calc_log.dropped, kind="counter")
+metrics.gauge("history_dropped_records_total", "Calculations dropped before reaching the history database.",
+              lambda: history.dropped, kind="counter")
+metrics.gauge("expression_cache_hits_total", "Compiled expression cache hits.", lambda: calc_engine.cache_info().hits, kind="counter")
+metrics.gauge("expression_cache_misses_total", "Compiled expression cache misses.", lambda: calc_engine.cache_info().misses, kind="counter")
+
 # HTML + CSS + JS Calculator (All in one file)
 CALCULATOR_HTML = """
 <!DOCTYPE html>
@@ -127,40 +157,185 @@ CALCULATOR_HTML = """
         
         function calculate() {
             const display = document.getElementById('display');
-            try {
-                // Replace × with *
-                let expression = display.value.replace(/×/g, '*');
-                let result = eval(expression);
-                display.value = result;
-                // Send result to Flask
-                fetch('/calculate', {
-                    method: 'POST',
-                    headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
-                    body: 'expression=' + encodeURIComponent(display.value) + '&result=' + result
+            // Replace × with *
+            let expression = display.value.replace(/×/g, '*');
+            // Evaluated on the server by calc_engine
+            fetch('/calculate', {
+                method: 'POST',
+                headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+                body: 'expression=' + encodeURIComponent(expression)
+            })
+                .then(response => response.json())
+                .then(data => {
+                    display.value = data.error ? 'Error' : data.result;
+                })
+                .catch(() => {
+                    display.value = 'Error';
                 });
-            } catch (e) {
-                display.value = 'Error';
-            }
         }
     </script>
 </body>
 </html>
 """
 
+# === INDEX PAGE CACHE ===
+# The page only changes when the minute in the footer does, so it is
+# rendered (and compressed) once per minute and served from memory.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IST = timezone(timedelta(hours=5, minutes=30))
+calculator_template = app.jinja_env.from_string(CALCULATOR_HTML)
+
+
+class RenderedPage:
+    def __init__(self, minute):
+        self.minute = minute
+        html = calculator_template.render(now=minute.strftime("%I:%M %p IST, %d %B %Y"))
+        self.body = {"identity": html.encode("utf-8")}
+        self.body["gzip"] = gzip.compress(self.body["identity"], compresslevel=9)
+        if brotli is not None:
+            self.body["br"] = brotli.compress(self.body["identity"], quality=11)
+        self.etag = hashlib.sha1(self.body["identity"]).hexdigest()[:16]
+        self.expires = minute + timedelta(minutes=1)
+
+
+_page = None
+_page_lock = threading.Lock()
+
+
+def current_page():
+    global _page
+    minute = datetime.now(IST).replace(second=0, microsecond=0)
+    page = _page
+    if page is None or page.minute != minute:
+        with _page_lock:
+            if _page is None or _page.minute != minute:
+                _page = RenderedPage(minute)
+            page = _page
+    return page
+
+
+def pick_encoding(page):
+    accepted = request.accept_encodings
+    for encoding in ("br", "gzip"):
+        if encoding in page.body and accepted[encoding]:
+            return encoding
+    return "identity"
+
+
 @app.route("/")
+@metrics.timed("index")
 def index():
-    from datetime import datetime
-    ist_time = (datetime.utcnow().timestamp() + 5.5*3600)
-    now = datetime.fromtimestamp(ist_time).strftime("%I:%M %p IST, %d %B %Y")
-    return render_template_string(CALCULATOR_HTML, now=now)
+    page = current_page()
+    encoding = pick_encoding(page)
+    response = Response(page.body[encoding], mimetype="text/html")
+    if encoding != "identity":
+        response.headers["Content-Encoding"] = encoding
+    response.headers["Vary"] = "Accept-Encoding"
+    # Each encoding is a different representation, so it gets its own ETag
+    response.set_etag(page.etag if encoding == "identity" else f"{page.etag}-{encoding}")
+    response.last_modified = page.minute
+    seconds_left = max(0, int((page.expires - datetime.now(IST)).total_seconds()))
+    response.cache_control.public = True
+    response.cache_control.max_age = seconds_left
+    return response.make_conditional(request)
 
 @app.route("/calculate", methods=["POST"])
+@metrics.timed("calculate")
 def calculate():
-    # Optional: Log calculation (not used in UI)
-    expression = request.form.get("expression", "")
-    result = request.form.get("result", "")
-    print(f"Calculation: {expression} = {result}")
-    return "OK"
+    # Accepts form posts from the UI or JSON from other services
+    data = request.get_json(silent=True)
+    if data is None:
+        data = request.form
+    elif not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object or a form post"}), 400
+    expression = str(data.get("expression", ""))
+    try:
+        result = evaluate(expression)
+    except CalcError as e:
+        calc_log.log(expression=expression, error=str(e))
+        return jsonify({"expression": expression, "error": str(e)}), 400
+    calc_log.log(expression=expression, result=result)
+    return jsonify({"expression": expression, "result": result})
+
+@app.route("/calculate/batch", methods=["POST"])
+@metrics.timed("calculate_batch")
+def calculate_batch():
+    # Many calculations in one request:
+    #   JSON {"expressions": ["1+2", "3*4", ...]}
+    #   JSON {"expression": "a*b+c", "columns": {"a": [...], "b": [...], "c": [...]}}
+    #   CSV body (header row = variable names) with ?expression=a*b+c
+    try:
+        if request.mimetype == "text/csv":
+            expression = request.args.get("expression", "")
+            return _batch_columns(expression, _read_csv_columns(request.get_data(as_text=True)))
+
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise CalcError("Expected a JSON object or a text/csv body")
+        if "expressions" in data:
+            expressions = data["expressions"]
+            if not isinstance(expressions, list):
+                raise CalcError("'expressions' must be a list")
+            results = [
+                {"expression": e, "error": error} if error else {"expression": e, "result": result}
+                for e, (result, error) in zip(expressions, evaluate_many(expressions))
+            ]
+            calc_log.log(batch=len(results), errors=sum("error" in r for r in results))
+            return jsonify({"count": len(results), "results": results})
+
+        columns = data.get("columns", {})
+        if not isinstance(columns, dict) or not all(isinstance(v, list) for v in columns.values()):
+            raise CalcError("'columns' must map names to lists of values")
+        return _batch_columns(str(data.get("expression", "")), columns)
+    except CalcError as e:
+        return jsonify({"error": str(e)}), 400
+
+
+def _read_csv_columns(text):
+    reader = csv.reader(io.StringIO(text))
+    header = next(reader, None)
+    if not header:
+        raise CalcError("CSV body needs a header row")
+    names = [h.strip() for h in header]
+    values = [[] for _ in names]
+    for row in reader:
+        for column, cell in zip(values, row):
+            column.append(cell)
+    return dict(zip(names, values))
+
+
+def _batch_columns(expression, columns):
+    results = evaluate_columns(expression, columns)
+    errors = sum(r is None for r in results)
+    calc_log.log(expression=expression, batch=len(results), errors=errors)
+    return jsonify({"expression": expression, "count": len(results), "errors": errors, "results": results})
+
+@app.route("/history")
+@metrics.timed("history")
+def calculation_history():
+    # /history?limit=50&since=<unix ts>&until=<unix ts>&expression=1%2B1&cursor=<next_cursor>
+    args = request.args
+    try:
+        page = history.query(
+            limit=args.get("limit", 50),
+            since=args.get("since"),
+            until=args.get("until"),
+            expression=args.get("expression"),
+            cursor=args.get("cursor"),
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    # Calculations this process dropped under load (not in the history)
+    page["dropped"] = history.dropped
+    return jsonify(page)
+
+@app.route("/metrics")
+def prometheus_metrics():
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
 
 if __name__ == "__main__":
     print("India Calculator Running!")
@@ -0,0 +1,163 @@
+# loadtest_calculator.py
+# Load generator for flask_calculator.py
+# Drives GET / and POST /calculate over keep-alive connections from many
+# threads and reports requests/sec and p50/p95/p99 latency per route.
+#
+#   python loadtest_calculator.py --url http://127.0.0.1:8000 --clients 32 --duration 10
+#
+# With --sweep it starts serve_calculator.py itself for each server
+# configuration in SWEEP and prints one table row per configuration.
+import argparse
+import http.client
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+# (label, serve_calculator.py arguments)
+SWEEP = [
+    ("waitress 1x8", ["--server", "waitress", "--threads", "8"]),
+    ("waitress 1x32", ["--server", "waitress", "--threads", "32"]),
+    ("gunicorn 2x8", ["--server", "gunicorn", "--workers", "2", "--threads", "8"]),
+    ("gunicorn 4x8", ["--server", "gunicorn", "--workers", "4", "--threads", "8"]),
+]
+
+EXPRESSIONS = ["12+7*3", "(1500-250)/4", "2**10-1", "(3.5+4.25)*(12-7)/3", "99/3"]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, int(round(p / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+class Client(threading.Thread):
+    def __init__(self, host, port, deadline, calculate_ratio, seed):
+        super().__init__(daemon=True)
+        self.host, self.port = host, port
+        self.deadline = deadline
+        self.calculate_ratio = calculate_ratio
+        self.rng = random.Random(seed)
+        self.latencies = {"/": [], "/calculate": []}
+        self.errors = 0
+
+    def run(self):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+        while time.perf_counter() < self.deadline:
+            if self.rng.random() < self.calculate_ratio:
+                route = "/calculate"
+                body = urlencode({"expression": self.rng.choice(EXPRESSIONS)})
+                headers = {"Content-Type": "application/x-www-form-urlencoded"}
+                method = "POST"
+            else:
+                route, body, method = "/", None, "GET"
+                headers = {"Accept-Encoding": "gzip"}
+            start = time.perf_counter()
+            try:
+                conn.request(method, route, body=body, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    self.errors += 1
+                    continue
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                conn.close()
+                conn = http.client.HTTPConnection(self.host, self.port, timeout=10)
+                continue
+            self.latencies[route].append(time.perf_counter() - start)
+        conn.close()
+
+
+def run_load(url, clients, duration, calculate_ratio):
+    parts = urlsplit(url)
+    deadline = time.perf_counter() + duration
+    threads = [Client(parts.hostname, parts.port or 80, deadline, calculate_ratio, seed=i) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    report = {}
+    for route in ("/", "/calculate"):
+        values = sorted(v for t in threads for v in t.latencies[route])
+        report[route] = {
+            "requests": len(values),
+            "rps": len(values) / elapsed,
+            "p50": percentile(values, 50) * 1000,
+            "p95": percentile(values, 95) * 1000,
+            "p99": percentile(values, 99) * 1000,
+        }
+    report["errors"] = sum(t.errors for t in threads)
+    return report
+
+
+def print_header():
+    print(f"{'config':<16}{'route':<12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    print("-" * 76)
+
+
+def print_report(label, report):
+    for route in ("/", "/calculate"):
+        r = report[route]
+        errors = report["errors"] if route == "/" else ""
+        print(f"{label:<16}{route:<12}{r['rps']:>10,.0f}{r['p50']:>10.2f}{r['p95']:>10.2f}{r['p99']:>10.2f}{errors:>8}")
+
+
+def wait_until_up(host, port, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=1)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+            return True
+        except OSError:
+            time.sleep(0.2)
+    return False
+
+
+def sweep(port, clients, duration, calculate_ratio):
+    here = os.path.dirname(os.path.abspath(__file__))
+    print_header()
+    for label, server_args in SWEEP:
+        if server_args[1] == "gunicorn" and os.name != "posix":
+            continue
+        cmd = [sys.executable, os.path.join(here, "serve_calculator.py"), "--host", "127.0.0.1", "--port", str(port)] + server_args
+        proc = subprocess.Popen(cmd, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            if not wait_until_up("127.0.0.1", port):
+                print(f"{label:<16}server did not start")
+                continue
+            print_report(label, run_load(f"http://127.0.0.1:{port}", clients, duration, calculate_ratio))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the India Calculator")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent keep-alive connections")
+    parser.add_argument("--duration", type=float, default=10, help="seconds per run")
+    parser.add_argument("--calculate-ratio", type=float, default=0.5, help="share of requests that POST /calculate")
+    parser.add_argument("--sweep", action="store_true", help="start serve_calculator.py for each config in SWEEP")
+    parser.add_argument("--port", type=int, default=8765, help="port used by --sweep")
+    args = parser.parse_args()
+
+    if args.sweep:
+        sweep(args.port, args.clients, args.duration, args.calculate_ratio)
+    else:
+        print_header()
+        print_report(urlsplit(args.url).netloc, run_load(args.url, args.clients, args.duration, args.calculate_ratio))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,79 +1,147 @@
 # playwright_demo.py
-from playwright.sync_api import sync_playwright
+# One-shot:  python playwright_demo.py
+# Watch:     python playwright_demo.py --watch --interval 30 --headless
+#            (keeps one browser open and re-polls the match page)
+# Fast:      add --fast to skip images, fonts, CSS, ads and trackers
+# Offline:   add --site http://127.0.0.1:8000 with score_fixture_site.py running
+# HTTP:      add --http-first [--match-url URL] to try a plain GET before the browser
+# Every new score is appended to score_history.jsonl (unchanged scores are
+# skipped); score.txt always holds the latest one.
+# Timing:    add --trace runs.jsonl and/or --metrics scraper.prom for
+#            per-phase durations (launch, goto, search, waits, ...)
+import argparse
+import json
 import time
+from contextlib import nullcontext
 from datetime import datetime
 
-def get_ind_vs_aus_score():
-    score_file = "score.txt"  # File to save score
-    with sync_playwright() as p:
-        print("Launching browser...")
-        browser = p.chromium.launch(headless=False)  # Change to True for no window
-        page = browser.new_page()
+from score_history import HISTORY_FILE, ScoreHistory, write_snapshot
+from score_http import HttpFirstWatcher
+from score_trace import Tracer
+from score_watcher import POLL_INTERVAL, SITE, ScoreWatcher
 
-        try:
-            print("Going to Cricbuzz...") 
-            page.goto("https://www.cricbuzz.com")
-
-            print("Searching: India vs Australia")
-            page.fill("input[placeholder='Search for Team, Player or Series']", "India vs Australia")
-            page.press("input[placeholder='Search for Team, Player or Series']", "Enter")
-
-            page.wait_for_selector("a[href*='cricket-match']", timeout=15000)
-
-            match = page.query_selector("a:has-text('IND'):has-text('AUS')") or \
-                    page.query_selector("a:has-text('India'):has-text('Australia')")
-
-            if match:
-                match.click()
-                page.wait_for_load_state("networkidle")
-                time.sleep(3)
-
-                score_elem = page.locator(".cbz-scorecard-title, .cb-col-100.cb-lv-scrs-col, .cb-lv-scrs-col").first
-                if score_elem and score_elem.inner_text().strip():
-                    score_text = score_elem.inner_text().strip()
-                    
-                    # Current time in IST
-                    now = datetime.now().strftime("%Y-%m-%d %I:%M %p IST")
-
-                    # Print to terminal
-                    print("\n" + "="*60)
-                    print("INDIA vs AUSTRALIA - LIVE SCORE")
-                    print("="*60)
-                    print(score_text)
-                    print(f"Updated: {now}")
-                    print("="*60)
-
-                    # SAVE TO score.txt
-                    with open(score_file, "w", encoding="utf-8") as f:
-                        f.write("INDIA vs AUSTRALIA - LIVE SCORE\n")
-                        f.write("="*60 + "\n")
-                        f.write(score_text + "\n")
-                        f.write(f"Updated: {now}\n")
-                        f.write("="*60 + "\n")
-                    print(f"\nScore saved to {score_file}")
+SCORE_FILE = "score.txt"  # File to save score
+MATCH = "India vs Australia"
+
+
+def save_score(score_text, score_file=SCORE_FILE, history=None, source=None):
+    """Print and save a score; returns False (and writes nothing) if it hasn't changed."""
+    history = history or ScoreHistory(HISTORY_FILE)
+    record = history.record(MATCH, score_text, source=source)
+    if record is None:
+        print(f"Score unchanged: {score_text}")
+        return False
+
+    # Current time in IST
+    now = datetime.fromtimestamp(record["ts"]).strftime("%Y-%m-%d %I:%M %p IST")
+
+    # Print to terminal
+    print("\n" + "="*60)
+    print("INDIA vs AUSTRALIA - LIVE SCORE")
+    print("="*60)
+    print(score_text)
+    print(f"Updated: {now}")
+    print("="*60)
+
+    # SAVE TO score.txt (replaced in one step, readers never see it half-written)
+    write_snapshot(score_file, "INDIA vs AUSTRALIA - LIVE SCORE\n" + "="*60 + "\n" + score_text + "\n" +
+                   f"Updated: {now}\n" + "="*60 + "\n")
+    print(f"\nScore saved to {score_file} and {history.path}")
+    return True
+
+
+def save_message(message, score_file=SCORE_FILE):
+    print(message)
+    write_snapshot(score_file, message + "\n")
+
+
+def make_watcher(headless, fast, site, http_first=False, match_url=None, tracer=None):
+    if http_first:
+        # Chromium is only launched if the page has no server-rendered score
+        return HttpFirstWatcher(match_url=match_url, site=site, headless=headless, fast=fast, tracer=tracer)
+    watcher = ScoreWatcher(site=site, headless=headless, fast=fast, tracer=tracer)
+    watcher.match_url = match_url
+    return watcher
+
+
+def get_ind_vs_aus_score(headless=False, fast=False, site=SITE, http_first=False, match_url=None,
+                         tracer=None, metrics_file=None):
+    print("Launching browser..." if not http_first else "Fetching score...")
+    # The whole one-shot (startup, poll, pause, close) is one traced run
+    with tracer.run("oneshot") if tracer else nullcontext() as trace:
+        with make_watcher(headless, fast, site, http_first, match_url, tracer) as watcher:
+            try:
+                print("Going to Cricbuzz...")
+                print("Searching: India vs Australia")
+                score_text = watcher.poll()
+                if score_text is None:
+                    save_message("No live India vs Australia match found.")
+                elif score_text:
+                    save_score(score_text, source=watcher.match_url)
                 else:
-                    message = "Score not found on page."
-                    print(message)
-                    with open(score_file, "w") as f:
-                        f.write(message + "\n")
-            else:
-                message = "No live India vs Australia match found."
-                print(message)
-                with open(score_file, "w") as f:
-                    f.write(message + "\n")
-
-            # AUTO-CLOSE AFTER 10 SECONDS
-            print("\nBrowser will auto-close in 10 seconds...")
-            time.sleep(10)
-
-        except Exception as e:
-            error_msg = f"Error: {e}"
-            print(error_msg)
-            with open(score_file, "w") as f:
-                f.write(error_msg + "\n")
-        finally:
-            print("Closing browser...")
-            browser.close()
+                    save_message("Score not found on page.")
+
+                if not watcher.headless and watcher.browser_started:
+                    # AUTO-CLOSE AFTER 10 SECONDS (only when there is a window to look at)
+                    print("\nBrowser will auto-close in 10 seconds...")
+                    with tracer.phase("view_pause") if tracer else nullcontext():
+                        time.sleep(10)
+
+            except Exception as e:
+                save_message(f"Error: {e}")
+                if trace is not None:
+                    trace.error = f"{e.__class__.__name__}: {e}"
+            finally:
+                print("Closing browser...")
+    if tracer:
+        print(json.dumps(tracer.runs[-1].as_dict()))
+        if metrics_file:
+            tracer.write_metrics(metrics_file)
+
+
+def watch_ind_vs_aus_score(interval=POLL_INTERVAL, headless=True, fast=False, site=SITE, http_first=False,
+                           match_url=None, max_polls=None, tracer=None, metrics_file=None):
+    history = ScoreHistory(HISTORY_FILE)
+
+    def on_score(score_text, error):
+        if metrics_file:
+            tracer.write_metrics(metrics_file)
+        if error is not None:
+            print(f"Poll failed ({error.__class__.__name__}), recovering: {error}")
+        elif score_text is None:
+            save_message("No live India vs Australia match found.")
+        else:
+            save_score(score_text, history=history, source=watcher.match_url)
+
+    print(f"Watching India vs Australia every {interval}s (Ctrl+C to stop)...")
+    with make_watcher(headless, fast, site, http_first, match_url, tracer) as watcher:
+        try:
+            watcher.watch(on_score, interval=interval, max_polls=max_polls)
+        except KeyboardInterrupt:
+            pass
+        print(f"Stopped after {watcher.polls} polls ({watcher.recoveries} recoveries).")
+
 
 if __name__ == "__main__":
-    get_ind_vs_aus_score()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="India vs Australia live score from Cricbuzz")
+    parser.add_argument("--watch", action="store_true", help="keep the browser open and poll repeatedly")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL, help="seconds between polls in watch mode")
+    parser.add_argument("--headless", action="store_true", help="no browser window (always on in watch/fast mode)")
+    parser.add_argument("--fast", action="store_true", help="block images, fonts, CSS and third-party requests")
+    parser.add_argument("--site", default=SITE, help="site to scrape, e.g. a local score_fixture_site.py")
+    parser.add_argument("--http-first", action="store_true", help="plain HTTP GET first, browser only as fallback")
+    parser.add_argument("--match-url", help="match page to poll (skips the site search)")
+    parser.add_argument("--trace", metavar="FILE", help="append per-phase timings of every run to FILE (JSON lines)")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="keep Prometheus metrics for the runs in FILE (counts carry over between runs)")
+    args = parser.parse_args()
+    tracer = Tracer(json_path=args.trace) if args.trace or args.metrics else None
+    if args.metrics:
+        # One-shot runs from cron each add to the totals already in the file
+        tracer.load_metrics(args.metrics)
+    if args.watch:
+        watch_ind_vs_aus_score(interval=args.interval, fast=args.fast, site=args.site, http_first=args.http_first,
+                               match_url=args.match_url, tracer=tracer, metrics_file=args.metrics)
+    else:
+        get_ind_vs_aus_score(headless=args.headless, fast=args.fast, site=args.site, http_first=args.http_first,
+                             match_url=args.match_url, tracer=tracer, metrics_file=args.metrics)
@@ -1,10 +1,18 @@
 import streamlit as st
-import pandas as pd
 import os
+import queue
+import sqlite3
 import time
+from concurrent.futures import TimeoutError as SaveTimeout
+from customer_export import FORMATS, available_formats, read_export
+from customer_import import guess_mapping, import_customers
+from file_import import read_columns
+from customer_store import DuplicateCustomer, normalize, open_store
+from customer_writer import CustomerWriter, WriterClosed
 
 # === CONFIG ===
-excel_file = "customers.xlsx"
+db_file = os.environ.get("CUSTOMERS_DB", "customers.db")
+excel_file = "customers.xlsx"  # old storage, imported into db_file on first run
 columns = ["Name", "Father Name", "Education"]
 
 # Page config
@@ -66,19 +74,32 @@ if 'show_thanks' not in st.session_state:
     st.session_state.show_thanks = False
 if 'just_submitted' not in st.session_state:
     st.session_state.just_submitted = False
+if 'customer_cursors' not in st.session_state:
+    st.session_state.customer_cursors = [None]  # page stack for the customer table
 
 # === LOAD & SAVE FUNCTIONS ===
-@st.cache_data
-def load_data():
-    if os.path.exists(excel_file):
-        return pd.read_excel(excel_file)
-    return pd.DataFrame(columns=columns)
+@st.cache_resource
+def get_store():
+    # Names are unique ignoring case and extra spaces; fuzzy=True also keeps
+    # a trigram index for "similar name" warnings
+    return open_store(db_file, legacy_excel=excel_file, fuzzy=True)
 
-def save_data(df):
-    df.to_excel(excel_file, index=False)
-    st.cache_data.clear()
+@st.cache_resource
+def get_writer():
+    # One writer thread for all sessions; submissions arriving together
+    # are committed in a single transaction
+    return CustomerWriter(get_store())
 
-df = load_data()
+def save_customer(name, father_name, education):
+    # Queued to the shared writer; waits until the row is committed
+    writer.add(name, father_name, education)
+    st.session_state.customer_cursors = [None]
+
+def reset_pages():
+    st.session_state.customer_cursors = [None]
+
+store = get_store()
+writer = get_writer()
 
 # === FORM SECTION ===
 with st.form("customer_form", clear_on_submit=True):
@@ -97,17 +118,68 @@ with st.form("customer_form", clear_on_submit=True):
     if submitted:
         if not all([name.strip(), father_name.strip(), education.strip()]):
             st.error("Please fill all fields!")
-        elif name.strip() in df["Name"].values:
+        elif store.exists(name.strip()):
             st.error(f"{name} is already registered!")
         else:
-            new_row = {"Name": name.strip(), "Father Name": father_name.strip(), "Education": education.strip()}
-            df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-            save_data(df)
-            
-            st.session_state.show_thanks = True
-            st.session_state.just_submitted = True
-            st.success(f"Customer {name.strip()} added successfully!")
-            st.balloons()
+            similar = [n for n, _ in store.similar(name) if normalize(n) != normalize(name)]
+            try:
+                save_customer(name.strip(), father_name.strip(), education.strip())
+            except DuplicateCustomer:
+                # Someone else registered the same name a moment ago
+                st.error(f"{name} is already registered!")
+            except SaveTimeout:
+                # Still queued; it may yet be saved, so don't invite a resubmit
+                st.error("Saving is taking longer than usual. Check the customer list before trying again.")
+            except (queue.Full, WriterClosed, sqlite3.Error):
+                st.error("Could not save right now, please try again in a moment.")
+            else:
+                st.session_state.show_thanks = True
+                st.session_state.just_submitted = True
+                st.success(f"Customer {name.strip()} added successfully!")
+                if similar:
+                    st.warning(f"Similar names already registered: {', '.join(similar)}")
+                st.balloons()
+
+# === BULK IMPORT ===
+with st.expander("Import Customers (CSV / Excel)"):
+    upload = st.file_uploader("Customer list", type=["csv", "xlsx"])
+    if upload is not None:
+        try:
+            file_columns = read_columns(upload, upload.name)
+        except Exception as e:
+            st.error(f"Could not read the file: {e}")
+            file_columns = []
+        if file_columns:
+            guessed = guess_mapping(file_columns)
+            choices = ["(none)"] + file_columns
+            mapping = {}
+            for field, map_col in zip(columns, st.columns(len(columns))):
+                picked = map_col.selectbox(field, choices, index=choices.index(guessed[field]) if guessed[field] else 0,
+                                           key=f"map_{field}")
+                mapping[field] = None if picked == "(none)" else picked
+
+            if st.button("Import"):
+                bar = st.progress(0.0, text="Importing...")
+
+                def show_progress(fraction, result):
+                    bar.progress(fraction, text=f"Imported {result.imported:,} rows, rejected {result.rejected:,}")
+
+                try:
+                    # Whole chunks are committed at once, so this goes to the
+                    # store directly rather than row by row through the writer
+                    result = import_customers(store, upload, upload.name, mapping, progress=show_progress)
+                except Exception as e:
+                    st.error(f"Import stopped: {e}")
+                else:
+                    bar.progress(1.0, text="Done")
+                    st.success(f"Imported {result.imported:,} customers.")
+                    if result.rejected:
+                        st.warning(f"{result.rejected:,} rows were rejected.")
+                        st.dataframe(
+                            {"Row": [r for r, _ in result.rejected_rows], "Reason": [r for _, r in result.rejected_rows]},
+                            hide_index=True
+                        )
+                reset_pages()
 
 # === THANK YOU MESSAGE ===
 if st.session_state.show_thanks:
@@ -134,29 +206,58 @@ if st.session_state.show_thanks:
         st.rerun()
 
 # === DISPLAY EXISTING DATA ===
-if not df.empty:
+# Search, sort and paging run in SQLite; only the visible page is styled
+# and sent to the browser
+total = store.count()
+if total:
     st.markdown("---")
-    st.markdown(f"<h2 style='color: white; text-shadow: 1px 1px 5px #000;'>Total Customers: {len(df)}</h2>", unsafe_allow_html=True)
-    st.dataframe(
-        df.style.set_properties(**{
-            'background-color': 'rgba(255,255,255,0.15)',
-            'color': 'white',
-            'border': '1px solid #00ff88',
-            'text-align': 'center'
-        }),
-        use_container_width=True,
-        hide_index=True
-    )
+    st.markdown(f"<h2 style='color: white; text-shadow: 1px 1px 5px #000;'>Total Customers: {total}</h2>", unsafe_allow_html=True)
+    search_col, order_col = st.columns([2, 1])
+    with search_col:
+        search = st.text_input("Search by name", placeholder="Name starts with...", on_change=reset_pages)
+    with order_col:
+        order = st.selectbox("Sort by", ["name", "newest", "oldest"], format_func=str.title, on_change=reset_pages)
+
+    cursors = st.session_state.customer_cursors
+    page, next_cursor = store.page(search, order, cursor=cursors[-1])
+    if search:
+        st.caption(f"{store.count(search)} matching customers")
+    if not page.empty:
+        st.dataframe(
+            page.style.set_properties(**{
+                'background-color': 'rgba(255,255,255,0.15)',
+                'color': 'white',
+                'border': '1px solid #00ff88',
+                'text-align': 'center'
+            }),
+            use_container_width=True,
+            hide_index=True
+        )
+    else:
+        st.info("No customers match your search.")
+
+    nav_prev, nav_page, nav_next = st.columns([1, 1, 1])
+    nav_page.markdown(f"<p style='text-align: center; color: white;'>Page {len(cursors)}</p>", unsafe_allow_html=True)
+    if len(cursors) > 1 and nav_prev.button("Previous", use_container_width=True):
+        cursors.pop()
+        st.rerun()
+    if next_cursor and nav_next.button("Next", use_container_width=True):
+        cursors.append(next_cursor)
+        st.rerun()
 else:
     st.info("No customers yet. Add the first one!")
 
 # === DOWNLOAD BUTTON ===
-if not df.empty:
-    csv = df.to_csv(index=False).encode()
+# The export is only built when the button is clicked, and reused until a
+# customer is added
+if total:
+    formats = available_formats()
+    fmt = st.selectbox("Export format", formats, format_func=lambda f: FORMATS[f][0])
     st.download_button(
-        "Download All Data (CSV)",
-        csv,
-        "customers_backup.csv",
-        "text/csv",
+        f"Download All Data ({FORMATS[fmt][0]})",
+        lambda: read_export(store, fmt),
+        f"customers_backup.{FORMATS[fmt][1]}",
+        FORMATS[fmt][2],
+        on_click="ignore",
         use_container_width=True
     )
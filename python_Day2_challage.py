@@ -1,9 +1,14 @@
+import os
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
+from expense_charts import TOP_N, render_balance_chart, render_spent_chart, top_n
+from expense_db import ExpenseDB
+from expense_import import FIELDS, guess_mapping, import_expenses
+from file_import import read_columns
+from expense_ledger import ExpenseLedger
+from expense_settle import settle_auto, to_paise
 
 # ====================== PAGE CONFIG ======================
 st.set_page_config(page_title="Expense Splitter", layout="wide", page_icon="moneybag")
@@ -78,33 +83,71 @@ st.markdown("""
 
 st.markdown("---")
 
+# ====================== DATABASE ======================
+# One SQLite file shared by every session; groups, people and expenses
+# survive restarts. Only the selected group's totals are loaded.
+@st.cache_resource
+def get_db():
+    return ExpenseDB(os.environ.get("EXPENSES_DB", "expenses.db"))
+
+db = get_db()
+
 # ====================== SESSION STATE INIT ======================
-if 'people' not in st.session_state:
-    st.session_state.people = []
-if 'expenses' not in st.session_state:
-    st.session_state.expenses = []
-if 'df_expenses' not in st.session_state:
-    st.session_state.df_expenses = pd.DataFrame(columns=['Paid By', 'Amount', 'Description', 'Date', 'Split Among'])
+if 'expense_cursors' not in st.session_state:
+    st.session_state.expense_cursors = [None]  # page stack for "Recent Expenses"
+
+# ====================== CHART CACHE ======================
+# Keyed by a hash of the chart data: a rerun that doesn't change any
+# balance gets the PNG bytes back without importing matplotlib.
+@st.cache_data(max_entries=32, show_spinner=False)
+def balance_chart_png(labels, values):
+    return render_balance_chart(list(labels), list(values))
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def spent_chart_png(labels, values):
+    return render_spent_chart(list(labels), list(values))
+
+# ====================== SIDEBAR: GROUP ======================
+with st.sidebar:
+    st.header("Group")
+    groups = db.groups() or ["My Group"]
+    group_name = st.selectbox("Select Group", options=groups)
+    new_group = st.text_input("New Group", placeholder="e.g. Goa Trip")
+    if st.button("Create Group") and new_group.strip():
+        db.group_id(new_group.strip())
+        st.rerun()
+    group_id = db.group_id(group_name)
+
+    if st.session_state.get("group_id") != group_id:
+        st.session_state.group_id = group_id
+        st.session_state.expense_cursors = [None]
+
+    people = db.people(group_id)
+    # Aggregated paid/owed per person, kept current by the database
+    ledger = ExpenseLedger.from_totals(db.totals(group_id))
 
 # ====================== SIDEBAR: ADD PEOPLE ======================
 with st.sidebar:
+    st.markdown("---")
     st.header("Manage Participants")
     new_person = st.text_input("Add Person", placeholder="e.g. Alex")
     if st.button("Add Person"):
-        if new_person.strip() and new_person.strip() not in st.session_state.people:
-            st.session_state.people.append(new_person.strip())
+        if new_person.strip() and new_person.strip() not in people:
+            db.add_person(group_id, new_person.strip())
+            people.append(new_person.strip())
             st.success(f"{new_person.strip()} added!")
-        elif new_person.strip() in st.session_state.people:
+        elif new_person.strip() in people:
             st.warning("Person already exists!")
     
     st.markdown("---")
     st.subheader("Current Participants")
-    if st.session_state.people:
-        for i, person in enumerate(st.session_state.people):
+    if people:
+        for i, person in enumerate(people):
             col1, col2 = st.columns([3, 1])
             col1.write(f"**{person}**")
             if col2.button("Remove", key=f"rm_{i}"):
-                st.session_state.people.pop(i)
+                db.remove_person(group_id, person)
                 st.rerun()
     else:
         st.info("No participants yet.")
@@ -115,10 +158,10 @@ col1, col2 = st.columns([1, 1])
 with col1:
     st.subheader("Add New Expense")
     with st.form("expense_form", clear_on_submit=True):
-        paid_by = st.selectbox("Paid By", options=st.session_state.people, index=None, placeholder="Select payer")
+        paid_by = st.selectbox("Paid By", options=people, index=None, placeholder="Select payer")
         amount = st.number_input("Amount (₹)", min_value=0.01, step=0.01, format="%.2f")
         desc = st.text_input("Description", placeholder="e.g. Dinner at BBQ Nation")
-        split_among = st.multiselect("Split Among", options=st.session_state.people, default=st.session_state.people)
+        split_among = st.multiselect("Split Among", options=people, default=people)
 
         submitted = st.form_submit_button("Add Expense")
 
@@ -128,68 +171,104 @@ with col1:
             elif amount <= 0:
                 st.error("Amount must be positive!")
             else:
-                new_expense = {
-                    "Paid By": paid_by,
-                    "Amount": amount,
-                    "Description": desc,
-                    "Date": datetime.now().strftime("%Y-%m-%d %H:%M"),
-                    "Split Among": ", ".join(split_among)
-                }
-                st.session_state.expenses.append(new_expense)
-                new_df = pd.DataFrame([new_expense])
-                st.session_state.df_expenses = pd.concat([st.session_state.df_expenses, new_df], ignore_index=True)
+                paise = to_paise(amount)
+                db.add_expense(group_id, paid_by, paise, desc, datetime.now(), split_among)
+                ledger.add_expense(paid_by, paise, split_among)
+                st.session_state.expense_cursors = [None]
                 st.success(f"Expense of ₹{amount:.2f} added!")
                 st.balloons()
 
 with col2:
     st.subheader("Recent Expenses")
-    if not st.session_state.df_expenses.empty:
-        display_df = st.session_state.df_expenses.copy()
-        display_df["Amount"] = display_df["Amount"].apply(lambda x: f"₹{x:,.2f}")
-        st.dataframe(display_df[["Paid By", "Amount", "Description", "Date"]], use_container_width=True)
+    # One page from the database at a time, newest first
+    cursors = st.session_state.expense_cursors
+    page, next_cursor = db.expense_page(group_id, cursor=cursors[-1])
+    if page:
+        st.dataframe(
+            pd.DataFrame(page).set_index("ID")[["Paid By", "Amount", "Description", "Date"]],
+            use_container_width=True,
+            column_config={"Amount": st.column_config.NumberColumn(format="₹%.2f")},
+        )
+        nav_newer, nav_older = st.columns(2)
+        if len(cursors) > 1 and nav_newer.button("Newer"):
+            cursors.pop()
+            st.rerun()
+        if next_cursor and nav_older.button("Older"):
+            cursors.append(next_cursor)
+            st.rerun()
+        # Whole group only on click: loaded into NumPy columns, then one CSV
+        st.download_button(
+            "Download All Expenses (CSV)",
+            lambda: db.expense_store(group_id).to_frame(split_among=True).to_csv(index=False).encode(),
+            "expenses.csv",
+            "text/csv",
+            on_click="ignore",
+        )
     else:
         st.info("No expenses added yet.")
 
+# ====================== BULK IMPORT ======================
+with st.expander("Import Expenses (CSV / Excel)"):
+    upload = st.file_uploader("Bank or card export", type=["csv", "xlsx"])
+    if upload is not None:
+        try:
+            columns = read_columns(upload, upload.name)
+        except Exception as e:
+            st.error(f"Could not read the file: {e}")
+            columns = []
+        if columns:
+            guessed = guess_mapping(columns)
+            choices = ["(none)"] + columns
+            map_cols = st.columns(len(FIELDS))
+            mapping = {}
+            for field, map_col in zip(FIELDS, map_cols):
+                picked = map_col.selectbox(field, choices, index=choices.index(guessed[field]) if guessed[field] else 0,
+                                           key=f"map_{field}")
+                mapping[field] = None if picked == "(none)" else picked
+            default_payer = st.selectbox("Payer when the file has none", options=people, index=None)
+            st.caption("Rows without Split Among are split among all current participants.")
+
+            if st.button("Import"):
+                bar = st.progress(0.0, text="Importing...")
+
+                def show_progress(fraction, result):
+                    bar.progress(fraction, text=f"Imported {result.imported:,} rows, rejected {result.rejected:,}")
+
+                try:
+                    result = import_expenses(db, group_id, upload, upload.name, mapping,
+                                             default_payer=default_payer, default_split=people,
+                                             progress=show_progress)
+                except Exception as e:
+                    st.error(f"Import stopped: {e}")
+                else:
+                    bar.progress(1.0, text="Done")
+                    st.success(f"Imported {result.imported:,} expenses.")
+                    if result.rejected:
+                        st.warning(f"{result.rejected:,} rows were rejected.")
+                        st.dataframe(pd.DataFrame(result.rejected_rows, columns=["Row", "Reason"]), hide_index=True)
+                # Balances below come from the updated database totals
+                ledger = ExpenseLedger.from_totals(db.totals(group_id))
+                people = db.people(group_id)
+                st.session_state.expense_cursors = [None]
+
 # ====================== CALCULATE SPLIT ======================
-if st.session_state.people and st.session_state.expenses:
+if people and ledger.total():
     st.markdown("---")
     st.subheader("Balance Summary")
 
-    # Calculate total spent per person
-    total_spent = {p: 0.0 for p in st.session_state.people}
-    for exp in st.session_state.expenses:
-        total_spent[exp["Paid By"]] += exp["Amount"]
-
-    # Calculate per person share
-    total_amount = sum(total_spent.values())
-    n = len(st.session_state.people)
-    per_person = total_amount / n if n > 0 else 0
-
-    # Calculate net balance
-    balance = {p: total_spent[p] - per_person for p in st.session_state.people}
-
-    # Prepare transactions (who owes whom)
-    creditors = {k: v for k, v in balance.items() if v > 0.01}
-    debtors = {k: -v for k, v in balance.items() if v < -0.01}
-
-    transactions = []
-    for debtor, owes in debtors.items():
-        for creditor, owed in creditors.items():
-            if owes > 0 and owed > 0:
-                transfer = min(owes, owed)
-                transactions.append({
-                    "From": debtor,
-                    "To": creditor,
-                    "Amount": transfer
-                })
-                debtors[debtor] -= transfer
-                owes -= transfer
-                creditors[creditor] -= transfer
-                owed -= transfer
-                if owes <= 0.01:
-                    break
-        if owes <= 0.01:
-            continue
+    # Paid / owed totals are kept up to date by the ledger as expenses are
+    # added, and each expense is only shared among its own "Split Among"
+    # people. Anyone who was removed but still has expenses stays in here.
+    balance_paise = ledger.balances()
+    total_spent = {p: paise / 100 for p, paise in ledger.paid.items()}
+    should_pay = {p: paise / 100 for p, paise in ledger.owed.items()}
+    balance = {p: paise / 100 for p, paise in balance_paise.items()}
+
+    # Prepare transactions (who owes whom), settled in whole paise
+    transactions = [
+        {"From": debtor, "To": creditor, "Amount": paise / 100}
+        for debtor, creditor, paise in settle_auto(balance_paise)
+    ]
 
     # Display results
     col_a, col_b = st.columns(2)
@@ -215,38 +294,23 @@ if st.session_state.people and st.session_state.expenses:
     st.markdown("---")
     st.subheader("Spending Overview")
 
-    fig, ax = plt.subplots(figsize=(10, 6))
-    colors = ['#000000' if x >= 0 else '#888888' for x in balance.values()]
-    bars = ax.bar(balance.keys(), balance.values(), color=colors, edgecolor='black', linewidth=1.5)
-    ax.set_ylabel("Net Balance (₹)", fontsize=12, fontweight='bold')
-    ax.set_title("Who Owes / Is Owed", fontsize=16, fontweight='bold', pad=20)
-    ax.axhline(0, color='black', linewidth=1)
-    ax.grid(True, axis='y', linestyle='--', alpha=0.3)
-
-    # Add value labels on bars
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height + (0.01 if height >= 0 else -0.01),
-                f'₹{abs(height):.2f}', ha='center', va='bottom' if height >= 0 else 'top',
-                fontweight='bold', fontsize=10)
+    # Large groups: biggest bars only, everyone else folded into "Others"
+    chart_top_n = TOP_N
+    if len(balance) > TOP_N:
+        chart_top_n = st.slider("People shown in charts", 5, min(len(balance), 200), TOP_N)
 
-    st.pyplot(fig)
+    labels, values = top_n(list(balance), list(balance.values()), chart_top_n, signed=True)
+    st.image(balance_chart_png(tuple(labels), tuple(values)), use_container_width=True)
 
     # ====================== TOTAL SPENT CHART ======================
     st.markdown("#### Total Spent by Each Person")
-    spent_df = pd.DataFrame(list(total_spent.items()), columns=['Person', 'Spent'])
-    fig2, ax2 = plt.subplots(figsize=(10, 5))
-    sns.barplot(data=spent_df, x='Person', y='Spent', palette='Greys', ax=ax2)
-    ax2.set_ylabel("Amount (₹)")
-    ax2.set_title("Total Amount Paid")
-    for i, v in enumerate(spent_df['Spent']):
-        ax2.text(i, v + 0.01, f"₹{v:,.2f}", ha='center', fontweight='bold')
-    st.pyplot(fig2)
+    labels, values = top_n(list(total_spent), list(total_spent.values()), chart_top_n)
+    st.image(spent_chart_png(tuple(labels), tuple(values)), use_container_width=True)
 
     # ====================== DOWNLOAD RESULTS ======================
     result_df = pd.DataFrame([
-        {"Person": p, "Total Paid": total_spent[p], "Should Pay": per_person, "Net": balance[p]}
-        for p in st.session_state.people
+        {"Person": p, "Total Paid": total_spent[p], "Should Pay": should_pay[p], "Net": balance[p]}
+        for p in ledger.people()
     ])
     csv = result_df.to_csv(index=False).encode()
     st.download_button(
@@ -0,0 +1,170 @@
+# score_async.py
+# Scrape many matches at once with the async Playwright API
+# One browser and one context; a pool of at most `concurrency` pages is
+# shared by all fixtures, each fixture gets its own timeout, and results
+# come back in input order. Twenty matches take about as long as the
+# slowest one instead of twenty browser runs back to back.
+# Run: python score_async.py "India vs Australia" "England vs South Africa" ...
+#      python score_async.py --site http://127.0.0.1:8000 https://.../live-cricket-scores/...
+import argparse
+import asyncio
+import json
+import time
+
+from playwright.async_api import async_playwright
+
+from score_watcher import MATCH_LINK, SCORE_SELECTOR, SEARCH_INPUT, SITE, TIMEOUT_MS, is_blocked, site_domain
+
+CONCURRENCY = 5
+MATCH_TIMEOUT = 20  # seconds per fixture, search included
+
+
+class ScrapeResult:
+    def __init__(self, fixture):
+        self.fixture = fixture
+        self.url = None
+        self.score = None
+        self.error = None
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return self.score is not None
+
+    def as_dict(self):
+        return {"fixture": self.fixture, "url": self.url, "score": self.score, "error": self.error,
+                "elapsed": round(self.elapsed, 3)}
+
+
+def _is_url(fixture):
+    return isinstance(fixture, str) and fixture.startswith(("http://", "https://"))
+
+
+def _teams(fixture):
+    """("India", "Australia"), "India vs Australia" or "IND v AUS" -> two names."""
+    if isinstance(fixture, str):
+        for sep in (" vs ", " v "):
+            if sep in fixture.lower():
+                i = fixture.lower().index(sep)
+                return fixture[:i].strip(), fixture[i + len(sep):].strip()
+        raise ValueError(f"Fixture must be a URL or 'Team A vs Team B': {fixture!r}")
+    return tuple(fixture[:2])
+
+
+class _PagePool:
+    """Up to `size` pages in one context, created on demand and reused."""
+
+    def __init__(self, context, size):
+        self.context = context
+        self._idle = asyncio.Queue()
+        self._slots = asyncio.Semaphore(size)
+
+    async def acquire(self):
+        await self._slots.acquire()
+        try:
+            page = self._idle.get_nowait()
+        except asyncio.QueueEmpty:
+            page = await self.context.new_page()
+            page.set_default_timeout(TIMEOUT_MS)
+        return page
+
+    async def release(self, page, broken=False):
+        # A page that timed out may still be mid-navigation; don't reuse it
+        if broken or page.is_closed():
+            try:
+                await page.close()
+            except Exception:
+                pass  # already gone with a crashed renderer
+        else:
+            self._idle.put_nowait(page)
+        self._slots.release()
+
+
+async def _find_match(page, site, teams):
+    await page.goto(site, wait_until="domcontentloaded")
+    await page.fill(SEARCH_INPUT, " vs ".join(teams))
+    await page.press(SEARCH_INPUT, "Enter")
+    await page.wait_for_selector(MATCH_LINK)
+    link = page.locator(f"a:has-text('{teams[0]}'):has-text('{teams[1]}')").first
+    if not await link.count():
+        return None
+    return await link.evaluate("a => a.href")
+
+
+async def _read_score(page, url):
+    await page.goto(url, wait_until="domcontentloaded")
+    await page.wait_for_function(
+        "selector => { const el = document.querySelector(selector);"
+        " return el && el.innerText.trim().length > 0; }",
+        arg=SCORE_SELECTOR)
+    return (await page.locator(SCORE_SELECTOR).first.inner_text()).strip()
+
+
+async def _scrape_one(pool, site, fixture, timeout):
+    result = ScrapeResult(fixture)
+    page = await pool.acquire()
+    # The timeout and elapsed time start once a page is free, not while queued
+    start = time.perf_counter()
+    broken = False
+    try:
+        async def work():
+            result.url = fixture if _is_url(fixture) else await _find_match(page, site, _teams(fixture))
+            if result.url is None:
+                result.error = "no match found"
+            else:
+                result.score = await _read_score(page, result.url)
+
+        await asyncio.wait_for(work(), timeout)
+    except asyncio.TimeoutError:
+        result.error = f"timed out after {timeout}s"
+        broken = True
+    except Exception as e:
+        result.error = f"{e.__class__.__name__}: {e}"
+        broken = True
+    finally:
+        await pool.release(page, broken)
+        result.elapsed = time.perf_counter() - start
+    return result
+
+
+async def scrape_matches(fixtures, site=SITE, concurrency=CONCURRENCY, timeout=MATCH_TIMEOUT, fast=True,
+                         headless=True):
+    """Scrape every fixture (match URL, "Team A vs Team B" or (team_a, team_b)).
+
+    Returns one ScrapeResult per fixture, in the same order. Failures are
+    reported in the result, never raised.
+    """
+    domain = site_domain(site)
+
+    async def route(r):
+        if is_blocked(r.request, domain):
+            await r.abort()
+        else:
+            await r.continue_()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            context = await browser.new_context(service_workers="block" if fast else "allow")
+            if fast:
+                await context.route("**/*", route)
+            pool = _PagePool(context, concurrency)
+            return await asyncio.gather(*(_scrape_one(pool, site, f, timeout) for f in fixtures))
+        finally:
+            await browser.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape several live scores at once")
+    parser.add_argument("fixtures", nargs="+", help="match URLs or 'Team A vs Team B'")
+    parser.add_argument("--site", default=SITE)
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--timeout", type=float, default=MATCH_TIMEOUT, help="seconds per match")
+    parser.add_argument("--full", action="store_true", help="load images, CSS and third-party requests too")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    results = asyncio.run(scrape_matches(args.fixtures, args.site, args.concurrency, args.timeout,
+                                         fast=not args.full))
+    for result in results:
+        print(json.dumps(result.as_dict(), ensure_ascii=False))
+    print(f"{sum(r.ok for r in results)}/{len(results)} scraped in {time.perf_counter() - started:.2f}s")
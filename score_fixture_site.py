@@ -0,0 +1,195 @@
+# score_fixture_site.py
+# Local stand-in for Cricbuzz, for benchmarking the score scraper offline
+# Two servers: the "site" (home page with the search box, search results,
+# match pages) and a third-party "ads" host on a different hostname whose
+# every response is slow. Pages pull in images, fonts, CSS, ad scripts and
+# a tracker that keeps beaconing, so networkidle settles late or never,
+# like the real thing.
+# Run standalone: python score_fixture_site.py [--port 8000] [--ad-delay 1.5]
+import argparse
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+AD_DELAY = 1.5  # seconds every third-party response takes
+ADS_PER_PAGE = 8
+
+# (id, team A, team B, code A, code B)
+MATCHES = [
+    (1001, "India", "Australia", "IND", "AUS"),
+    (1002, "England", "South Africa", "ENG", "RSA"),
+    (1003, "Pakistan", "New Zealand", "PAK", "NZ"),
+    (1004, "Sri Lanka", "Bangladesh", "SL", "BAN"),
+    (1005, "West Indies", "Afghanistan", "WI", "AFG"),
+]
+
+PNG_1PX = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082")
+
+
+def match_path(match):
+    match_id, team_a, team_b, code_a, code_b = match
+    return f"/live-cricket-scores/{match_id}/{code_a.lower()}-vs-{code_b.lower()}-cricket-match"
+
+
+def live_score(match, now=None):
+    """A score that moves on every few seconds, so watchers see changes."""
+    match_id, team_a, team_b, code_a, code_b = match
+    balls = int((now or time.time()) / 5) % 300 + match_id % 50
+    runs = balls * 7 // 6
+    return f"{code_a} {runs}/{balls // 60} ({balls // 6}.{balls % 6} ov)"
+
+
+def _page(title, body, ads_url):
+    ads = "".join(f'<img class="ad" src="{ads_url}/ad/{i}.png" width="300" height="250">'
+                  for i in range(ADS_PER_PAGE))
+    return f"""<!doctype html>
+<html><head><meta charset="utf-8"><title>{escape(title)}</title>
+<link rel="stylesheet" href="/static/site.css">
+<link rel="stylesheet" href="{ads_url}/fonts.css">
+<script src="{ads_url}/ads.js"></script>
+</head><body>
+<header><img src="/static/logo.png" alt="logo">
+<form action="/search"><input name="q" placeholder="Search for Team, Player or Series"></form></header>
+<main>{body}</main>
+<aside>{ads}</aside>
+<script src="{ads_url}/tracker.js" async></script>
+</body></html>"""
+
+
+class SiteHandler(BaseHTTPRequestHandler):
+    # Set on the subclass made by FixtureSite
+    ads_url = ""
+    render = "server"  # "server": score in the HTML, "js": filled in by a script after load
+    page_delay = 0.0   # seconds each match page takes to serve
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type="text/html; charset=utf-8", status=200):
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/":
+            self._send(_page("Cricket Live Scores", "<h1>Live Cricket Scores</h1>", self.ads_url))
+        elif url.path == "/search":
+            words = parse_qs(url.query).get("q", [""])[0].lower().replace(" vs ", " ").split()
+            links = "".join(
+                f'<a href="{match_path(m)}">{m[3]} vs {m[4]} - {escape(m[1])} vs {escape(m[2])}, Live</a><br>'
+                for m in MATCHES if words and all(w in f"{m[1]} {m[2]} {m[3]} {m[4]}".lower() for w in words))
+            self._send(_page("Search", links or "<p>No results</p>", self.ads_url))
+        elif url.path.startswith("/live-cricket-scores/"):
+            match = next((m for m in MATCHES if url.path == match_path(m)), None)
+            if match is None:
+                return self._send("not found", "text/plain", 404)
+            time.sleep(self.page_delay)
+            self._send(self._match_page(match))
+        elif url.path == "/static/site.css":
+            self._send("body{font-family:sans-serif}.ad{margin:4px}", "text/css")
+        elif url.path == "/static/logo.png":
+            self._send(PNG_1PX, "image/png")
+        else:
+            self._send("not found", "text/plain", 404)
+
+    def _match_page(self, match):
+        score = escape(live_score(match))
+        title = f"{match[1]} vs {match[2]}"
+        if self.render == "js":
+            body = (f'<h1>{escape(title)}</h1><div class="cb-col cb-col-100 cb-lv-scrs-col"></div>'
+                    f'<script>setTimeout(() => {{ document.querySelector(".cb-lv-scrs-col").innerText = '
+                    f'"{score}"; }}, 300);</script>')
+        else:
+            body = f'<h1>{escape(title)}</h1><div class="cb-col cb-col-100 cb-lv-scrs-col">{score}</div>'
+        return _page(title, body, self.ads_url)
+
+
+class AdsHandler(BaseHTTPRequestHandler):
+    delay = AD_DELAY
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        path = urlparse(self.path).path
+        if path.endswith(".png"):
+            body, content_type = PNG_1PX, "image/png"
+        elif path == "/tracker.js":
+            # Beacons forever, so the network never goes idle for long
+            body = (f"setInterval(() => fetch('http://{self.headers['Host']}/beacon?' + Date.now(), "
+                    "{mode: 'no-cors'}), 400);")
+            content_type = "application/javascript"
+        elif path.endswith(".js"):
+            body, content_type = "window.adsLoaded = true;", "application/javascript"
+        elif path.endswith(".css"):
+            body, content_type = "@font-face{font-family:x;src:local(Arial)}", "text/css"
+        else:
+            body, content_type = "", "text/plain"
+        data = body.encode() if isinstance(body, str) else body
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class FixtureSite:
+    """Running site + ads servers; use as a context manager or call close()."""
+
+    def __init__(self, port=0, ad_delay=AD_DELAY, render="server", page_delay=0.0):
+        self._ads = ThreadingHTTPServer(("127.0.0.1", 0), type("Ads", (AdsHandler,), {"delay": ad_delay}))
+        # "localhost" vs "127.0.0.1": a different hostname, so the ads are third-party
+        self.ads_url = f"http://localhost:{self._ads.server_address[1]}"
+        handler = type("Site", (SiteHandler,), {"ads_url": self.ads_url, "render": render, "page_delay": page_delay})
+        self._site = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.url = f"http://127.0.0.1:{self._site.server_address[1]}"
+        for server in (self._ads, self._site):
+            server.daemon_threads = True
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def match_urls(self):
+        return [self.url + match_path(m) for m in MATCHES]
+
+    def match_url(self, match=MATCHES[0]):
+        return self.url + match_path(match)
+
+    def search_url(self, query):
+        return f"{self.url}/search?q={quote(query)}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for server in (self._site, self._ads):
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ad-delay", type=float, default=AD_DELAY)
+    parser.add_argument("--render", choices=["server", "js"], default="server")
+    parser.add_argument("--page-delay", type=float, default=0.0)
+    args = parser.parse_args()
+    site = FixtureSite(args.port, args.ad_delay, args.render, args.page_delay)
+    print(f"Fixture site on {site.url} (ads on {site.ads_url}); Ctrl+C to stop")
+    print(f"Match page: {site.match_url()}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        site.close()
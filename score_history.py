@@ -0,0 +1,207 @@
+# score_history.py
+# Append-only score history for playwright_demo.py (JSON lines)
+# A record is only written when a match's score text changes, detected by
+# a content hash against the last record for that match. Each record is
+# one complete line written with a single O_APPEND write, so readers never
+# see half a record and several writers can share the file. Where fcntl
+# exists (Linux/macOS) the check-and-append holds an exclusive flock, so
+# writers in different processes also dedup against each other; on
+# Windows only writers within one process do.
+# Readers don't re-parse the file: read(offset) returns only what was
+# appended since `offset`, and follow() tails the file as it grows.
+# Opening the history doesn't parse it either: the last record for a match
+# is found by reading backwards from the end, only as far as needed.
+import hashlib
+import json
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock
+    fcntl = None
+
+HISTORY_FILE = "score_history.jsonl"
+FOLLOW_INTERVAL = 0.5  # seconds between checks for new lines in follow()
+BLOCK_SIZE = 64 * 1024  # bytes read per step when scanning backwards
+
+
+def score_hash(match, score):
+    return hashlib.sha256(f"{match}\x1f{score}".encode()).hexdigest()[:16]
+
+
+class ScoreHistory:
+    def __init__(self, path=HISTORY_FILE, fsync=False):
+        self.path = path
+        self.fsync = fsync
+        self.written = 0
+        self.unchanged = 0
+        self._lock = threading.Lock()
+        self._subscribers = []
+        self._last = {}  # match -> last record
+        # Records before _back haven't been looked at yet (scanned backwards
+        # on demand); records from _scanned on are read forwards as they arrive
+        self._scanned = self._back = self._end_of_last_line()
+
+    # === WRITE ===
+    def record(self, match, score, source=None, ts=None):
+        """Append a record if `score` differs from the last one for `match`.
+
+        Returns the new record, or None if the score is unchanged.
+        """
+        digest = score_hash(match, score)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                if fcntl:
+                    # Held until close: no other process appends between our check and write
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                self._catch_up()
+                if match not in self._last:
+                    self._scan_back(match)
+                last = self._last.get(match)
+                if last is not None and last["hash"] == digest:
+                    self.unchanged += 1
+                    return None
+                ts = time.time() if ts is None else ts
+                record = {"ts": round(ts, 3), "match": match, "score": score, "hash": digest}
+                if source:
+                    record["source"] = source
+                os.write(fd, (json.dumps(record, ensure_ascii=False) + "\n").encode())
+                if self.fsync:
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            self._last[match] = record
+            self.written += 1
+        for callback in list(self._subscribers):
+            try:
+                callback(record)
+            except Exception as e:
+                print(f"score_history: subscriber {callback!r} failed: {e}")
+        return record
+
+    def _end_of_last_line(self):
+        try:
+            with open(self.path, "rb") as f:
+                size = f.seek(0, os.SEEK_END)
+                start = max(0, size - BLOCK_SIZE)
+                f.seek(start)
+                cut = f.read().rfind(b"\n")
+        except FileNotFoundError:
+            return 0
+        # No newline near the end: read the whole file forwards instead
+        return start + cut + 1 if cut >= 0 else 0
+
+    def _scan_back(self, match=None):
+        """Read older records, newest first, until `match` is found (or the whole file for None)."""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            self._back = 0
+            return
+        with f:
+            if os.fstat(f.fileno()).st_size < self._back:
+                self._back = 0  # replaced or truncated; _catch_up starts over
+            size = BLOCK_SIZE
+            while self._back > 0 and (match is None or match not in self._last):
+                start = max(0, self._back - size)
+                f.seek(start)
+                data = f.read(self._back - start)
+                if start > 0:
+                    # The first line may have started before `start` (data
+                    # always ends with a newline, so skip that one)
+                    cut = data.find(b"\n", 0, len(data) - 1)
+                    if cut < 0:
+                        size *= 2
+                        continue
+                    data = data[cut + 1:]
+                    start += cut + 1
+                for line in reversed(data.splitlines()):
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Anything already known came later in the file
+                    self._last.setdefault(record["match"], record)
+                self._back = start
+
+    def _catch_up(self):
+        # Pick up lines other processes appended, so dedup sees their scores
+        records, self._scanned = self.read(self._scanned)
+        for record in records:
+            self._last[record["match"]] = record
+
+    # === READ ===
+    def latest(self, match=None):
+        """Last record for `match`, or {match: record} for every match."""
+        with self._lock:
+            self._catch_up()
+            if match is None or match not in self._last:
+                self._scan_back(match)
+            return self._last.get(match) if match is not None else dict(self._last)
+
+    def read(self, offset=0):
+        """Records appended at or after byte `offset`, and the offset to continue from.
+
+        A trailing line without its newline (still being written) is left
+        for the next call. If the file shrank (replaced or truncated),
+        reading restarts from the beginning.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                if os.fstat(f.fileno()).st_size < offset:
+                    offset = 0
+                f.seek(offset)
+                data = f.read()
+        except FileNotFoundError:
+            return [], 0
+        end = data.rfind(b"\n") + 1
+        records = []
+        for line in data[:end].splitlines():
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    pass  # corrupt line; skip rather than stop every reader
+        return records, offset + end
+
+    def follow(self, offset=None, interval=FOLLOW_INTERVAL, stop=None):
+        """Yield new records as they are appended, forever (or until stop() is true).
+
+        offset=None starts at the current end of the file; pass 0 to replay
+        the whole history first.
+        """
+        if offset is None:
+            offset = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        while stop is None or not stop():
+            records, offset = self.read(offset)
+            yield from records
+            if not records:
+                time.sleep(interval)
+
+    def subscribe(self, callback):
+        """Call callback(record) for every record this instance writes; returns an unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+
+def write_snapshot(path, text):
+    """Replace `path` with `text` atomically (temp file + rename)."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # python score_history.py [file]  - print updates as they arrive
+    history = ScoreHistory(sys.argv[1] if len(sys.argv) > 1 else HISTORY_FILE)
+    try:
+        for update in history.follow():
+            print(time.strftime("%H:%M:%S", time.localtime(update["ts"])), update["match"], "-", update["score"])
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,157 @@
+# score_http.py
+# HTTP-first score fetching for playwright_demo.py
+# When the match page already has the score in its server-rendered HTML,
+# one keep-alive GET and a parse is all a poll needs. HttpFirstWatcher
+# tries that first and only starts Chromium (the ScoreWatcher flow) for
+# pages that fill the score in with JavaScript, or when the fetch fails.
+# selectolax is used for parsing when installed, otherwise the stdlib
+# HTMLParser (stops at the first score element).
+import importlib.util
+import re
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from score_watcher import SCORE_SELECTOR, SITE, ScoreWatcher
+
+HTTP_TIMEOUT = 10  # seconds
+POOL_SIZE = 10
+RETRY_HTTP_AFTER = 10  # browser polls after an HTTP miss before HTTP is tried again
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+# ".a.b, .c" -> [{"a", "b"}, {"c"}]; only class selectors are needed here
+SCORE_CLASSES = [set(part.strip().lstrip(".").split(".")) for part in SCORE_SELECTOR.split(",")]
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+_HAS_SELECTOLAX = importlib.util.find_spec("selectolax") is not None
+
+
+def new_session(pool_size=POOL_SIZE):
+    """requests.Session with a keep-alive connection pool sized for concurrent polls."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=1)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT, "Accept-Language": "en-IN,en;q=0.9"})
+    return session
+
+
+class _Found(Exception):
+    pass
+
+
+class _ScoreParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.depth = 0      # open elements inside the score element, 0 = not inside one
+        self.tag = None
+        self.parts = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.depth:
+            if tag == self.tag:
+                self.depth += 1
+            elif tag == "br":
+                self.parts.append("\n")
+            return
+        classes = set((dict(attrs).get("class") or "").split())
+        if tag not in VOID_TAGS and any(wanted <= classes for wanted in SCORE_CLASSES):
+            self.tag = tag
+            self.depth = 1
+            self.parts = []
+
+    def handle_endtag(self, tag):
+        if self.depth and tag == self.tag:
+            self.depth -= 1
+            if self.depth == 0:
+                if "".join(self.parts).strip():
+                    raise _Found
+                self.tag = None  # empty (filled in by JS later); keep looking
+
+    def handle_data(self, data):
+        if self.depth:
+            self.parts.append(data)
+
+
+def _tidy(text):
+    lines = (re.sub(r"[ \t\r\f\v]+", " ", line).strip() for line in text.split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def extract_score(html):
+    """Text of the first non-empty score element in the HTML, or None."""
+    if _HAS_SELECTOLAX:
+        from selectolax.parser import HTMLParser as FastParser
+        for node in FastParser(html).css(SCORE_SELECTOR):
+            text = _tidy(node.text(separator="\n"))
+            if text:
+                return text
+        return None
+    parser = _ScoreParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _Found:
+        return _tidy("".join(parser.parts))
+    return None
+
+
+def fetch_score(url, session=None, timeout=HTTP_TIMEOUT):
+    """Score from the server-rendered page; None if the HTML has no score text."""
+    response = (session or requests).get(url, timeout=timeout)
+    response.raise_for_status()
+    return extract_score(response.text)
+
+
+class HttpFirstWatcher(ScoreWatcher):
+    """ScoreWatcher that only launches the browser when plain HTTP can't get the score.
+
+    Pass match_url to skip the browser entirely for pages with a
+    server-rendered score; otherwise the browser finds the match once.
+    """
+
+    def __init__(self, match_url=None, session=None, retry_http_after=RETRY_HTTP_AFTER, site=SITE, **options):
+        super().__init__(site=site, **options)
+        self.match_url = match_url
+        self.session = session or new_session()
+        self.retry_http_after = retry_http_after
+        self.http_polls = 0
+        self.browser_polls = 0
+        self._skip_http = 0  # browser-only polls left before HTTP is retried
+
+    def __enter__(self):
+        # The browser is started lazily, on the first fallback
+        return self
+
+    def poll(self):
+        with self._run("poll"):
+            if self.match_url is not None:
+                if self._skip_http:
+                    self._skip_http -= 1
+                else:
+                    score = self._fetch()
+                    if score:
+                        self.http_polls += 1
+                        self.polls += 1
+                        return score
+                    # JS-rendered or unreachable: the browser takes over for a while
+                    self._skip_http = self.retry_http_after
+            self.browser_polls += 1
+            return super().poll()
+
+    def _fetch(self):
+        try:
+            with self._phase("http_fetch"):
+                response = self.session.get(self.match_url, timeout=HTTP_TIMEOUT)
+                response.raise_for_status()
+                html = response.text
+        except requests.RequestException:
+            return None
+        with self._phase("parse"):
+            return extract_score(html)
+
+    def close(self):
+        super().close()
+        self.session.close()
@@ -0,0 +1,210 @@
+# score_trace.py
+# Per-phase timing for the score scraper (score_watcher / score_http)
+# Each scraper run (one-shot, a watch poll, browser startup) becomes a
+# RunTrace holding how long every phase took: launch, goto, search,
+# wait_for_selector, the score wait, HTTP fetch/parse and any pause.
+# Finished runs can be appended to a JSON-lines file, aggregated into
+# Prometheus histograms (same text format as calc_metrics), and summarized
+# as percentiles by bench_score_phases.py. A metrics file can be loaded
+# back, so one-shot (cron) runs keep adding to the same counters.
+import json
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+from contextlib import contextmanager, nullcontext
+
+from score_history import write_snapshot
+
+# Upper bounds in seconds; the last bucket (+Inf) is implicit
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0)
+KEEP_RUNS = 1000
+
+
+class RunTrace:
+    def __init__(self, kind):
+        self.kind = kind
+        self.ts = time.time()
+        self.phases = {}  # name -> seconds (summed if a phase repeats)
+        self.total = 0.0
+        self.error = None
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - start
+
+    def as_dict(self):
+        return {
+            "ts": round(self.ts, 3),
+            "kind": self.kind,
+            "ok": self.error is None,
+            "error": self.error,
+            "total": round(self.total, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+        }
+
+
+class Tracer:
+    def __init__(self, json_path=None, keep=KEEP_RUNS):
+        self.json_path = json_path
+        self.runs = deque(maxlen=keep)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        # ("run" or "phase", kind or phase name) -> [bucket counts, count, sum]
+        self._histograms = defaultdict(lambda: [[0] * (len(BUCKETS) + 1), 0, 0.0])
+        self._outcomes = defaultdict(int)  # (kind, "ok"/"error") -> runs
+
+    @contextmanager
+    def run(self, kind="poll"):
+        """Trace one scraper run; nested calls join the run already in progress."""
+        current = getattr(self._local, "run", None)
+        if current is not None:
+            yield current
+            return
+        trace = self._local.run = RunTrace(kind)
+        try:
+            yield trace
+        except BaseException as e:
+            trace.error = f"{e.__class__.__name__}: {str(e).splitlines()[0] if str(e) else ''}"
+            raise
+        finally:
+            self._local.run = None
+            trace.total = time.perf_counter() - trace._start
+            self._finish(trace)
+
+    def phase(self, name):
+        """Time a phase of the current run (no-op outside a run)."""
+        current = getattr(self._local, "run", None)
+        return current.phase(name) if current is not None else nullcontext()
+
+    def _finish(self, trace):
+        with self._lock:
+            self.runs.append(trace)
+            self._outcomes[(trace.kind, "ok" if trace.error is None else "error")] += 1
+            self._observe(("run", trace.kind), trace.total)
+            for name, seconds in trace.phases.items():
+                self._observe(("phase", name), seconds)
+            if self.json_path:
+                with open(self.json_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(trace.as_dict()) + "\n")
+
+    def _observe(self, key, seconds):
+        histogram = self._histograms[key]
+        histogram[0][bisect_left(BUCKETS, seconds)] += 1
+        histogram[1] += 1
+        histogram[2] += seconds
+
+    # === REPORTING ===
+    def summary(self):
+        """{phase: {"count", "p50", "p95", "max", "mean"}} over the runs kept, plus "total"."""
+        with self._lock:
+            runs = list(self.runs)
+        samples = defaultdict(list)
+        for trace in runs:
+            samples["total"].append(trace.total)
+            for name, seconds in trace.phases.items():
+                samples[name].append(seconds)
+        return {name: _stats(values) for name, values in samples.items()}
+
+    def render(self, prefix="score_scraper"):
+        p = prefix
+        with self._lock:
+            histograms = {key: (list(h[0]), h[1], h[2]) for key, h in self._histograms.items()}
+            outcomes = dict(self._outcomes)
+        lines = [
+            f"# HELP {p}_runs_total Scraper runs, by kind and outcome.",
+            f"# TYPE {p}_runs_total counter",
+        ]
+        lines += [f'{p}_runs_total{{kind="{kind}",outcome="{outcome}"}} {n}'
+                  for (kind, outcome), n in sorted(outcomes.items())]
+        for family, label, help_text in (
+                ("run", "kind", "Wall time of a whole scraper run, by kind."),
+                ("phase", "phase", "Time spent in each scraper phase.")):
+            name = f"{p}_{family}_duration_seconds"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (kind, value), (buckets, count, total) in sorted(histograms.items()):
+                if kind != family:
+                    continue
+                cumulative = 0
+                for bound, n in zip(BUCKETS, buckets):
+                    cumulative += n
+                    lines.append(f'{name}_bucket{{{label}="{value}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{label}="{value}",le="+Inf"}} {count}')
+                lines.append(f'{name}_sum{{{label}="{value}"}} {total}')
+                lines.append(f'{name}_count{{{label}="{value}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def load_metrics(self, path, prefix="score_scraper"):
+        """Continue the counters and histograms in a file written by write_metrics.
+
+        A missing file, or one written with different BUCKETS, starts from zero.
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            return False
+        outcomes = defaultdict(int)
+        histograms = defaultdict(lambda: [[0] * (len(BUCKETS) + 1), 0, 0.0])
+        cumulative = defaultdict(dict)  # key -> {le: cumulative count}
+        families = {f"{prefix}_run_duration_seconds": ("run", "kind"),
+                    f"{prefix}_phase_duration_seconds": ("phase", "phase")}
+        for name, labels, value in _SAMPLE.findall(text):
+            labels = dict(_LABEL.findall(labels))
+            if name == f"{prefix}_runs_total":
+                outcomes[(labels["kind"], labels["outcome"])] = int(float(value))
+                continue
+            family, suffix = name.rsplit("_", 1)
+            if family not in families:
+                continue
+            kind, label = families[family]
+            key = (kind, labels[label])
+            if suffix == "bucket":
+                cumulative[key][labels["le"]] = int(float(value))
+            elif suffix == "sum":
+                histograms[key][2] = float(value)
+            elif suffix == "count":
+                histograms[key][1] = int(float(value))
+        bounds = [str(bound) for bound in BUCKETS]
+        for key, counts in cumulative.items():
+            if sorted(counts) != sorted(bounds + ["+Inf"]):
+                return False  # bucket layout changed; old counts can't be merged
+            previous = 0
+            for i, le in enumerate(bounds + ["+Inf"]):
+                histograms[key][0][i] = counts[le] - previous
+                previous = counts[le]
+        with self._lock:
+            for key, n in outcomes.items():
+                self._outcomes[key] += n
+            for key, (buckets, count, total) in histograms.items():
+                mine = self._histograms[key]
+                mine[0] = [a + b for a, b in zip(mine[0], buckets)]
+                mine[1] += count
+                mine[2] += total
+        return True
+
+    def write_metrics(self, path, prefix="score_scraper"):
+        """Write render() to a file atomically (for the node_exporter textfile collector)."""
+        write_snapshot(path, self.render(prefix))
+
+
+_SAMPLE = re.compile(r"^(\w+)\{([^}]*)\} (\S+)$", re.M)
+_LABEL = re.compile(r'(\w+)="([^"]*)"')
+
+
+def _stats(values):
+    values = sorted(values)
+    n = len(values)
+    return {
+        "count": n,
+        "p50": values[(n - 1) // 2],
+        "p95": values[min(n - 1, int(n * 0.95))],
+        "max": values[-1],
+        "mean": sum(values) / n,
+    }
@@ -0,0 +1,223 @@
+# score_watcher.py
+# Long-running live score poller for playwright_demo.py
+# One browser, context and page stay open for the life of the watcher.
+# The match is found through the site search once; after that each poll
+# is a reload of the match page that waits for the score element to have
+# text (no networkidle, no fixed sleeps). A crashed or closed page is
+# replaced, and a dead browser is relaunched, on the next poll.
+# fast=True also runs headless and blocks images, media, fonts, CSS and
+# every third-party request (ads, trackers) at the context level.
+# Pass a score_trace.Tracer to get per-phase timings of every poll.
+import time
+from contextlib import nullcontext
+from urllib.parse import urlparse
+
+from playwright.sync_api import Error as PlaywrightError
+from playwright.sync_api import sync_playwright
+
+# === SITE ===
+SITE = "https://www.cricbuzz.com"
+SEARCH_INPUT = "input[placeholder='Search for Team, Player or Series']"
+MATCH_LINK = "a[href*='cricket-match']"
+SCORE_SELECTOR = ".cbz-scorecard-title, .cb-col-100.cb-lv-scrs-col, .cb-lv-scrs-col"
+
+# === DEFAULTS ===
+TIMEOUT_MS = 15000
+POLL_INTERVAL = 30  # seconds between polls in watch mode
+MAX_FAILURES = 5    # consecutive failed polls before the match is searched for again
+
+# Resource types fast mode never loads; the score is plain text in the DOM
+BLOCKED_TYPES = {"image", "media", "font", "stylesheet", "texttrack", "eventsource", "websocket", "manifest", "other"}
+
+
+def site_domain(site):
+    # www.cricbuzz.com -> cricbuzz.com, so static.cricbuzz.com etc. stay first-party
+    host = urlparse(site).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def is_blocked(request, domain):
+    """Fast mode: skip non-document resources and anything off the site's domain."""
+    host = urlparse(request.url).hostname or ""
+    first_party = host == domain or host.endswith("." + domain)
+    return request.resource_type in BLOCKED_TYPES or not first_party
+
+
+class ScoreWatcher:
+    def __init__(self, teams=("India", "Australia"), codes=("IND", "AUS"), site=SITE, headless=True,
+                 timeout_ms=TIMEOUT_MS, fast=False, tracer=None):
+        self.teams = teams
+        self.codes = codes
+        self.site = site
+        self.headless = headless or fast
+        self.timeout_ms = timeout_ms
+        self.fast = fast
+        self.tracer = tracer
+        self.blocked = 0
+        self._site_domain = site_domain(site)
+        self.match_url = None
+        self.polls = 0
+        self.recoveries = 0
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._page = None
+        self._crashed = False
+
+    def __enter__(self):
+        try:
+            with self._run("startup"):
+                self.start()
+        except BaseException:
+            # __exit__ won't run; don't leave the Playwright driver behind
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # === TRACING ===
+    def _run(self, kind):
+        return self.tracer.run(kind) if self.tracer else nullcontext()
+
+    def _phase(self, name):
+        return self.tracer.phase(name) if self.tracer else nullcontext()
+
+    # === BROWSER LIFECYCLE ===
+    def start(self):
+        if self._playwright is None:
+            with self._phase("driver_start"):
+                self._playwright = sync_playwright().start()
+        if self._browser is None or not self._browser.is_connected():
+            with self._phase("launch"):
+                self._browser = self._playwright.chromium.launch(headless=self.headless)
+            self._context = None
+        if self._context is None:
+            with self._phase("new_context"):
+                self._context = self._new_context()
+            self._page = None
+        if self._page is None or self._page.is_closed() or self._crashed:
+            with self._phase("new_page"):
+                self._page = self._context.new_page()
+                self._page.set_default_timeout(self.timeout_ms)
+                self._page.on("crash", self._on_crash)
+            self._crashed = False
+        return self._page
+
+    @property
+    def browser_started(self):
+        return self._browser is not None
+
+    def _new_context(self):
+        if not self.fast:
+            return self._browser.new_context()
+        context = self._browser.new_context(service_workers="block")
+        context.route("**/*", self._route)
+        return context
+
+    def _route(self, route):
+        if is_blocked(route.request, self._site_domain):
+            self.blocked += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    def _on_crash(self, page):
+        self._crashed = True
+
+    def recover(self):
+        """Throw away whatever is broken (page, or the whole browser) and start again."""
+        self.recoveries += 1
+        if self._page is not None:
+            try:
+                self._page.close()
+            except PlaywrightError:
+                pass
+            self._page = None
+        if self._browser is not None and not self._browser.is_connected():
+            self._browser = None
+        self.start()
+
+    def close(self):
+        with self._phase("close"):
+            try:
+                if self._browser is not None and self._browser.is_connected():
+                    self._browser.close()
+            except PlaywrightError:
+                pass
+            if self._playwright is not None:
+                self._playwright.stop()
+        self._playwright = self._browser = self._context = self._page = None
+
+    # === SCRAPING ===
+    def find_match(self):
+        """Search the site for the match and remember its URL; None if there is no match."""
+        page = self.start()
+        with self._phase("goto_home"):
+            page.goto(self.site, wait_until="domcontentloaded")
+        with self._phase("search"):
+            page.fill(SEARCH_INPUT, " vs ".join(self.teams))
+            page.press(SEARCH_INPUT, "Enter")
+        with self._phase("wait_results"):
+            page.wait_for_selector(MATCH_LINK)
+        with self._phase("pick_match"):
+            match = page.query_selector(f"a:has-text('{self.codes[0]}'):has-text('{self.codes[1]}')") or \
+                page.query_selector(f"a:has-text('{self.teams[0]}'):has-text('{self.teams[1]}')")
+            self.match_url = page.evaluate("a => a.href", match) if match is not None else None
+        return self.match_url
+
+    def read_score(self):
+        """Score text of the page currently open, waiting until it is filled in."""
+        page = self._page
+        score = page.locator(SCORE_SELECTOR).first
+        with self._phase("wait_score"):
+            score.wait_for(state="attached")
+            # Live pages render the element first and fill it in afterwards
+            page.wait_for_function(
+                "selector => { const el = document.querySelector(selector);"
+                " return el && el.innerText.trim().length > 0; }",
+                arg=SCORE_SELECTOR)
+        with self._phase("read_score"):
+            return score.inner_text().strip()
+
+    def poll(self):
+        """Fetch the current score; None if no match could be found."""
+        with self._run("poll"):
+            if self.match_url is None and self.find_match() is None:
+                return None
+            page = self.start()
+            with self._phase("load_match"):
+                if page.url == self.match_url:
+                    page.reload(wait_until="domcontentloaded")
+                else:
+                    page.goto(self.match_url, wait_until="domcontentloaded")
+            self.polls += 1
+            return self.read_score()
+
+    def watch(self, on_score, interval=POLL_INTERVAL, max_polls=None):
+        """Poll forever (or max_polls times), calling on_score(text or None, error or None).
+
+        A failed poll recovers the page/browser and is retried at the next
+        interval; after MAX_FAILURES in a row the match is looked up again.
+        """
+        failures = 0
+        done = 0
+        while max_polls is None or done < max_polls:
+            started = time.monotonic()
+            try:
+                on_score(self.poll(), None)
+                failures = 0
+            except PlaywrightError as e:
+                failures += 1
+                on_score(None, e)
+                if failures >= MAX_FAILURES:
+                    self.match_url = None
+                    failures = 0
+                try:
+                    self.recover()
+                except PlaywrightError:
+                    pass  # e.g. relaunch failed; the next poll tries again
+            done += 1
+            if max_polls is None or done < max_polls:
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
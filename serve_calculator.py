@@ -0,0 +1,119 @@
+# serve_calculator.py
+# Production launcher for flask_calculator.py
+# `python flask_calculator.py` is the debug server (one process, reloader on).
+# This runs the same app under a real WSGI server instead:
+#
+#   python serve_calculator.py --server waitress --threads 16
+#   python serve_calculator.py --server gunicorn --workers 4 --threads 8   (Linux/macOS)
+#
+# Both servers finish in-flight requests on SIGINT/SIGTERM before exiting,
+# and the calculation log is flushed on the way out. Each gunicorn worker
+# writes its own calculations.<pid>.log; the history database is shared.
+import argparse
+import os
+import signal
+import sys
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8000
+
+
+def serve_waitress(args):
+    from waitress.server import create_server
+    from flask_calculator import app, calc_log
+
+    server = create_server(
+        app,
+        host=args.host,
+        port=args.port,
+        threads=args.threads,
+        connection_limit=args.connection_limit,
+        channel_timeout=args.keepalive,  # idle keep-alive connections are closed after this
+        backlog=args.backlog,
+    )
+
+    def shutdown(signum, frame):
+        print(f"Received signal {signum}, shutting down...")
+        server.close()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    print(f"waitress: http://{args.host}:{args.port} ({args.threads} threads)")
+    try:
+        server.run()
+    except OSError:
+        # asyncore loop raises once the listening socket is closed
+        pass
+    finally:
+        calc_log.close()
+
+
+def serve_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class CalculatorApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{args.host}:{args.port}")
+            self.cfg.set("workers", args.workers)
+            self.cfg.set("threads", args.threads)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("keepalive", args.keepalive)
+            self.cfg.set("backlog", args.backlog)
+            self.cfg.set("graceful_timeout", args.graceful_timeout)
+            self.cfg.set("worker_exit", _close_log_on_exit)
+
+        def load(self):
+            # Imported in each worker so every worker has its own log thread,
+            # writing (and rotating) its own file: calculations.<pid>.log
+            os.environ["CALC_LOG_FILE"] = worker_log_file(os.environ.get("CALC_LOG_FILE", "calculations.log"))
+            from flask_calculator import app
+            return app
+
+    print(f"gunicorn: http://{args.host}:{args.port} ({args.workers} workers x {args.threads} threads)")
+    CalculatorApplication().run()
+
+
+def worker_log_file(path, pid=None):
+    """calculations.log -> calculations.<pid>.log
+
+    Workers sharing one file would each rotate it on their own, shifting
+    the backups early and losing the oldest logs.
+    """
+    base, ext = os.path.splitext(path)
+    return f"{base}.{pid or os.getpid()}{ext}"
+
+
+def _close_log_on_exit(server, worker):
+    from flask_calculator import calc_log
+    calc_log.close()
+
+
+SERVERS = {
+    "waitress": serve_waitress,
+    "gunicorn": serve_gunicorn,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the India Calculator with a production WSGI server")
+    parser.add_argument("--server", choices=SERVERS, default="gunicorn" if os.name == "posix" else "waitress")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes (gunicorn only)")
+    parser.add_argument("--threads", type=int, default=8, help="threads per process")
+    parser.add_argument("--keepalive", type=int, default=5, help="seconds to keep idle connections open")
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--connection-limit", type=int, default=1000, help="max open connections (waitress only)")
+    parser.add_argument("--graceful-timeout", type=int, default=30, help="seconds to finish requests on shutdown (gunicorn only)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.server == "gunicorn" and os.name != "posix":
+        sys.exit("gunicorn needs Linux/macOS; use --server waitress on Windows")
+    SERVERS[args.server](args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# stress_customer_writer.py
+# Many concurrent submitters against one CustomerWriter, checking that no
+# customer is lost or registered twice.
+# Every submitter sends its own unique names plus a set of names that all
+# submitters race for; afterwards the database must hold every unique
+# name exactly once and each contested name exactly once, with exactly
+# one submitter told it succeeded.
+# With --processes each process runs its own writer against the same
+# file, as with several Streamlit servers sharing one database.
+# Run: python stress_customer_writer.py [--submitters 50] [--rows 200] [--processes 1]
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from customer_store import CustomerStore, DuplicateCustomer
+from customer_writer import CustomerWriter
+
+
+def submitter(writer, worker, rows, contested, outcomes, lock):
+    mine = [(f"Customer {worker}-{i}", f"Father {worker}", "BCom") for i in range(rows)]
+    shared = [(f"Contested {i}", f"Father {worker}", "BCom") for i in range(contested)]
+    # Interleave so contested names hit the queue while it is busy
+    jobs = [row for pair in zip(mine, shared) for row in pair] + mine[len(shared):] + shared[len(mine):]
+    futures = [(row[0], writer.submit(*row)) for row in jobs]
+    results = []
+    for name, future in futures:
+        try:
+            future.result(60)
+            results.append((name, "ok"))
+        except DuplicateCustomer:
+            results.append((name, "duplicate"))
+    with lock:
+        outcomes.extend(results)
+
+
+def run_process(path, submitters, rows, contested, process_id, conn=None):
+    writer = CustomerWriter(CustomerStore(path))
+    outcomes, lock = [], threading.Lock()
+    threads = [
+        threading.Thread(target=submitter, args=(writer, f"p{process_id}w{w}", rows, contested, outcomes, lock))
+        for w in range(submitters)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    writer.close()
+    if conn is not None:
+        conn.send((outcomes, writer.stats()))
+        conn.close()
+    return outcomes, writer.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submitters", type=int, default=50, help="concurrent submitter threads per process")
+    parser.add_argument("--rows", type=int, default=200, help="unique customers per submitter")
+    parser.add_argument("--contested", type=int, default=20, help="names every submitter tries to register")
+    parser.add_argument("--processes", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customers.db")
+        CustomerStore(path).close()  # create the schema once, before the race
+
+        start = time.perf_counter()
+        outcomes, stats = [], []
+        if args.processes == 1:
+            result, stat = run_process(path, args.submitters, args.rows, args.contested, 0)
+            outcomes.extend(result)
+            stats.append(stat)
+        else:
+            pipes, procs = [], []
+            for p in range(args.processes):
+                parent, child = multiprocessing.Pipe(duplex=False)
+                proc = multiprocessing.Process(
+                    target=run_process, args=(path, args.submitters, args.rows, args.contested, p, child))
+                proc.start()
+                pipes.append(parent)
+                procs.append(proc)
+            for parent in pipes:
+                result, stat = parent.recv()
+                outcomes.extend(result)
+                stats.append(stat)
+            for proc in procs:
+                proc.join()
+        elapsed = time.perf_counter() - start
+
+        store = CustomerStore(path)
+        stored = Counter(store.to_frame()["Name"])
+        store.close()
+
+    submissions = len(outcomes)
+    unique_expected = args.processes * args.submitters * args.rows
+    winners = Counter(name for name, status in outcomes if status == "ok" and name.startswith("Contested"))
+    errors = []
+    if sum(1 for name in stored if name.startswith("Customer")) != unique_expected:
+        errors.append(f"expected {unique_expected} unique customers, found "
+                      f"{sum(1 for name in stored if name.startswith('Customer'))}")
+    if any(n != 1 for n in stored.values()):
+        errors.append(f"{sum(1 for n in stored.values() if n != 1)} names stored more than once")
+    if any(not name.startswith("Contested") and status != "ok" for name, status in outcomes):
+        errors.append("a unique customer was rejected")
+    for i in range(args.contested):
+        if winners[f"Contested {i}"] != 1 or stored[f"Contested {i}"] != 1:
+            errors.append(f"Contested {i}: {winners[f'Contested {i}']} winners, {stored[f'Contested {i}']} rows")
+
+    batches = sum(s["batches"] for s in stats)
+    print(f"{submissions} submissions from {args.processes * args.submitters} submitters in {elapsed:.2f}s "
+          f"({submissions / elapsed:,.0f}/s)")
+    print(f"{sum(stored.values())} rows stored in {batches} transactions "
+          f"(avg {sum(s['written'] for s in stats) / max(batches, 1):.1f} rows per commit)")
+    if errors:
+        print("FAILED:")
+        for error in errors:
+            print(f"  {error}")
+        sys.exit(1)
+    print("OK: no lost or duplicated customers")
+
+
+if __name__ == "__main__":
+    main()